@@ -0,0 +1,139 @@
+import json
+from collections import OrderedDict
+from datetime import datetime
+from flask import Blueprint, Response, request, url_for, abort
+from models import db, Venue, Artist, Show
+from pagination import paginate
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+#----------------------------------------------------------------------------#
+# Read-only JSON API, /api/v1
+#----------------------------------------------------------------------------#
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+
+# public field name -> column; same keys as dictionary() / show_info()
+VENUE_FIELDS = OrderedDict((name, getattr(Venue, name)) for name in (
+    'id', 'name', 'city', 'state', 'address', 'phone', 'image_link',
+    'facebook_link', 'genres', 'website', 'seeking_talent', 'seeking_description'))
+
+ARTIST_FIELDS = OrderedDict((name, getattr(Artist, name)) for name in (
+    'id', 'name', 'city', 'state', 'phone', 'image_link', 'facebook_link',
+    'genres', 'website', 'seeking_venue', 'seeking_description'))
+
+SHOW_FIELDS = OrderedDict([
+    ('id', Show.id),
+    ('artist_id', Show.artist_id),
+    ('venue_id', Show.venue_id),
+    ('start_time', Show.start_time),
+    ('artist_name', Artist.name.label('artist_name')),
+    ('artist_image_link', Artist.image_link.label('artist_image_link')),
+    ('venue_name', Venue.name.label('venue_name')),
+    ('venue_image_link', Venue.image_link.label('venue_image_link'))
+])
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(repr(value))
+
+
+def dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, separators=(',', ':'), default=_default)
+
+
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def requested_fields(available):
+    fields = request.args.get('fields')
+    if not fields:
+        return list(available)
+    fields = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        abort(400, 'Unknown field(s): ' + ', '.join(unknown))
+    return fields
+
+
+def projected_query(model, available, fields, key):
+    # select only the requested columns, plus the key needed for paging
+    names = fields + [column.key for column in key if column.key not in fields]
+    query = db.session.query(*[available[name] for name in names]).select_from(model)
+    if model is Show:
+        # joined even for id-only fields, to hide shows of retired venues/artists
+        return query.join(Artist, Show.artist_id == Artist.id) \
+            .join(Venue, Show.venue_id == Venue.id) \
+            .filter(Artist.deleted_at.is_(None), Venue.deleted_at.is_(None))
+    return query.filter(model.deleted_at.is_(None))
+
+
+def serialize(row, fields):
+    return {name: getattr(row, name) for name in fields}
+
+
+def listing(model, available, key):
+    fields = requested_fields(available)
+    page = paginate(projected_query(model, available, fields, key), key)
+    next_url = None
+    if page.next_cursor:
+        next_url = url_for(request.endpoint, limit=page.limit, after=page.next_cursor,
+                           fields=request.args.get('fields'))
+    return json_response({
+        'data': [serialize(row, fields) for row in page.items],
+        'next_cursor': page.next_cursor,
+        'next': next_url
+    })
+
+
+def detail(model, available, id):
+    fields = requested_fields(available)
+    row = projected_query(model, available, fields, [model.id]) \
+        .filter(model.id == id).first()
+    if row is None:
+        abort(404)
+    return json_response({'data': serialize(row, fields)})
+
+
+@api.route('/venues')
+def venues():
+    return listing(Venue, VENUE_FIELDS, [Venue.id])
+
+
+@api.route('/venues/<int:venue_id>')
+def venue(venue_id):
+    return detail(Venue, VENUE_FIELDS, venue_id)
+
+
+@api.route('/artists')
+def artists():
+    return listing(Artist, ARTIST_FIELDS, [Artist.id])
+
+
+@api.route('/artists/<int:artist_id>')
+def artist(artist_id):
+    return detail(Artist, ARTIST_FIELDS, artist_id)
+
+
+@api.route('/shows')
+def shows():
+    return listing(Show, SHOW_FIELDS, [Show.start_time, Show.id])
+
+
+@api.route('/shows/<int:show_id>')
+def show(show_id):
+    return detail(Show, SHOW_FIELDS, show_id)
+
+
+@api.errorhandler(400)
+@api.errorhandler(404)
+def api_error(error):
+    return json_response({'error': error.description}, error.code)
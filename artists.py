@@ -0,0 +1,186 @@
+from datetime import datetime
+from flask import Blueprint, current_app, render_template, request, flash, redirect, url_for, abort
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, Artist, Show
+from pagination import paginate
+from counters import refresh_show_counters
+from search import search_by_name
+from browse import filter_listing
+from readmodels import NameRow, columns
+from conditional import conditional, versioned
+from extensions import page_cache
+from concurrency import gather
+from routing import read_only
+from views import split_shows, invalidate_artist, artist_venue_ids, listing_version, detail_version, ARTIST_PAGE
+
+artist_pages = Blueprint('artists', __name__)
+
+# validator shared by the conditional GET and the page cache of the detail page
+artist_version = versioned(lambda artist_id: detail_version(Artist, artist_id))
+
+#----------------------------------------------------------------------------#
+#  Artists
+#----------------------------------------------------------------------------#
+
+# Show Artist List
+@ artist_pages.route('/artists')
+@ conditional(lambda: listing_version(Artist))
+def artists():
+    artists = db.session.query(*columns(Artist, NameRow)).filter(Artist.deleted_at.is_(None))
+    page = paginate(filter_listing(artists, Artist), [Artist.id], NameRow)
+    return render_template('pages/artists.html', artists=page.items, page=page)
+
+# Create Artist Form
+@ artist_pages.route('/artists/create', methods=['GET'])
+def create_artist_form():
+    from forms import ArtistForm
+    form=ArtistForm(meta={"csrf": False})
+    return render_template('forms/new_artist.html', form=form)
+
+#Create Artist
+@ artist_pages.route('/artists/create', methods=['POST'])
+def create_artist_submission():
+    from forms import ArtistForm
+    form=ArtistForm(meta={"csrf": False})
+    # Error Handling
+    if not form.validate_on_submit():
+        errors = form.errors
+        for error in errors.values():
+            flash( error[0] )
+        return redirect(url_for('.create_artist_form'))
+    error=False
+    data=request.form
+
+    try:
+        new_artist=Artist(
+            name=data.get('name'),
+            city=data.get('city'),
+            state=data.get('state'),
+            phone=data.get('phone'),
+            image_link=data.get('image_link'),
+            facebook_link=data.get('facebook_link'),
+            genres=data.getlist('genres'),
+            website=data.get('website'),
+            seeking_venue=bool(data.get('seeking_venue')),
+            seeking_description=data.get('seeking_description')
+        )
+        db.session.add(new_artist)
+        db.session.commit()
+        # on successful db insert, flash success
+        flash('Artist ' + data['name'] + ' was successfully listed!')
+    except():
+        db.session.rollback()
+        error=True
+        # on unsuccessful db insert, flash an error
+        flash('An error occurred. Artist' +
+              data['name'] + ' could not be listed.')
+    return render_template('pages/home.html')
+
+# View Artist Page
+@ artist_pages.route('/artists/<int:artist_id>')
+@ conditional(artist_version)
+@ page_cache.cached(ARTIST_PAGE, artist_version)
+def show_artist(artist_id):
+    # the artist row and its shows are independent, fetched concurrently under
+    # gevent; the shows are one joined query, past/upcoming decided in SQL
+    artist, (past_shows, upcoming_shows) = gather(
+        lambda: Artist.query.get(artist_id),
+        lambda: split_shows(Show.info_query().filter(Show.artist_id == artist_id), datetime.now()))
+    if artist is None or artist.deleted_at is not None:
+        abort(404)
+    data = artist.dictionary()
+
+    # add upcoming/past show info to data dictionary
+    data["past_shows"]= past_shows
+    data["upcoming_shows"]= upcoming_shows
+    data["num_past_shows"]= len(past_shows)
+    data["num_upcoming_shows"]= len(upcoming_shows)
+   
+    return render_template('pages/show_artist.html', artist=data)
+
+# Search Artist
+@ artist_pages.route('/artists/search', methods=['POST'])
+@ read_only
+def search_artists():
+    search_term = request.form.get('search_term', '')
+    results = search_by_name(Artist, search_term)
+
+    response = {}
+    response['count'] = len(results)
+    response['data'] = results
+   
+    return render_template('pages/search_artists.html', results=response, search_term=search_term)
+
+# Update Artist Form
+@ artist_pages.route('/artists/<int:artist_id>/edit', methods=['GET'])
+def edit_artist(artist_id):
+    from forms import ArtistForm
+    form=ArtistForm(meta={"csrf": False})
+    artist = Artist.query.get(artist_id).dictionary()
+
+    return render_template('forms/edit_artist.html', form=form, artist=artist)
+
+# Update Artist
+@ artist_pages.route('/artists/<int:artist_id>/edit', methods=['POST'])
+def edit_artist_submission(artist_id):
+    from forms import ArtistForm
+
+    # Error Handling
+    form=ArtistForm(meta={"csrf": False})
+    if not form.validate_on_submit():
+        errors = form.errors
+        for error in errors.values():
+            flash( error[0] )
+        return redirect(url_for('.edit_artist', artist_id=artist_id))
+    
+    artist = Artist.query.filter(Artist.id == artist_id).one_or_none()
+    error = False
+    data=request.form
+
+    try:
+        artist.name=data.get('name'),
+        artist.city=data.get('city'),
+        artist.state=data.get('state'),
+        artist.phone=data.get('phone'),
+        artist.image_link=data.get('image_link'),
+        artist.facebook_link=data.get('facebook_link'),
+        artist.genres=data.getlist('genres'),
+        artist.website=data.get('website'),
+        
+        db.session.commit()
+        invalidate_artist(artist_id)
+        # on successful db insert, flash success
+        flash('Artist ' + data['name'] + ' was successfully updated!')
+    except():
+        db.session.rollback()
+        error=True
+        # on unsuccessful db insert, flash an error
+        flash('An error occurred. Artist' +
+              data['name'] + ' could not be updated.')
+
+    return redirect(url_for('.show_artist', artist_id=artist_id))
+
+# Delete Artist
+@ artist_pages.route('/artists/<int:artist_id>', methods=['POST'])
+def delete_artist(artist_id):
+    artist = Artist.query.get(artist_id)
+    if artist is None or artist.deleted_at is not None:
+        abort(404)
+    try:
+        # before delete() takes the shows linking them away
+        venue_ids = artist_venue_ids(artist_id)
+        if current_app.config['SOFT_DELETE'] or request.form.get('soft'):
+            artist.retire()
+        else:
+            artist.delete()
+        # retired or deleted, its shows no longer count as upcoming for them;
+        # one transaction, so the counters never disagree with the shows
+        refresh_show_counters(venue_ids=venue_ids)
+        db.session.commit()
+        invalidate_artist(artist_id, venue_ids)
+        flash('Artist deleted!')
+        return render_template('pages/home.html')
+    except SQLAlchemyError:
+        db.session.rollback()
+        flash('An error occured. Artist could not be deleted')
+    return redirect(url_for('.show_artist', artist_id=artist_id))
@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from collections import OrderedDict
+import click
+from flask import current_app, request, send_from_directory, url_for, abort
+from flask.cli import with_appcontext, AppGroup
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+#----------------------------------------------------------------------------#
+# Static asset bundles.
+#----------------------------------------------------------------------------#
+
+# bundle name -> source files under static/, in load order
+BUNDLES = OrderedDict([
+    ('main.css', ['css/bootstrap.min.css', 'css/layout.main.css', 'css/main.css',
+                  'css/main.responsive.css', 'css/main.quickfix.css']),
+    ('head.js', ['js/libs/modernizr-2.8.2.min.js', 'js/libs/moment.min.js', 'js/script.js']),
+    ('main.js', ['js/libs/jquery-1.11.1.min.js', 'js/libs/bootstrap-3.1.1.min.js', 'js/plugins.js'])
+])
+
+DIST = 'dist'
+MANIFEST = 'manifest.json'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+_css_comments = re.compile(r'/\*.*?\*/', re.S)
+_css_space = re.compile(r'\s*([{};,>])\s*')
+_source_map = re.compile(r'^\s*(//[#@] sourceMappingURL=.*|/\*# sourceMappingURL=.*\*/)$', re.M)
+
+
+def minify_css(text):
+    if rcssmin is not None:
+        return rcssmin.cssmin(text)
+    text = _css_comments.sub('', text)
+    text = _css_space.sub(r'\1', text)
+    return re.sub(r'\s+', ' ', text).replace(';}', '}').strip()
+
+
+def minify_js(text):
+    # without rjsmin, scripts are only concatenated
+    return rjsmin.jsmin(text) if rjsmin is not None else text.strip()
+
+
+def build_bundle(static_folder, name, sources):
+    # -> (fingerprinted file name, bytes)
+    minify = minify_css if name.endswith('.css') else minify_js
+    parts = []
+    for source in sources:
+        with open(os.path.join(static_folder, source), encoding='utf-8') as f:
+            text = _source_map.sub('', f.read())
+        parts.append(text.strip() if '.min.' in source else minify(text))
+    # ';' keeps concatenated scripts from running into each other
+    content = ('\n' if name.endswith('.css') else ';\n').join(parts).encode('utf-8')
+    stem, ext = os.path.splitext(name)
+    return '{}.{}{}'.format(stem, hashlib.sha256(content).hexdigest()[:12], ext), content
+
+
+def write_bundle(dist, filename, content):
+    # the bundle plus .gz/.br siblings for servers that send them as is
+    path = os.path.join(dist, filename)
+    with open(path, 'wb') as f:
+        f.write(content)
+    with gzip.open(path + '.gz', 'wb', compresslevel=9) as f:
+        f.write(content)
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(content, quality=11))
+
+
+def build(static_folder, bundles=BUNDLES):
+    dist = os.path.join(static_folder, DIST)
+    os.makedirs(dist, exist_ok=True)
+    manifest = OrderedDict()
+    for name, sources in bundles.items():
+        filename, content = build_bundle(static_folder, name, sources)
+        write_bundle(dist, filename, content)
+        manifest[name] = filename
+    with open(os.path.join(dist, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class Assets(object):
+
+    def __init__(self, app=None):
+        self.manifest = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.manifest = self.load_manifest(app)
+        app.add_url_rule('/static/{}/<path:filename>'.format(DIST), 'dist', self.send_dist)
+        app.add_template_global(self.urls, 'asset_urls')
+        app.cli.add_command(assets_command)
+        app.extensions['assets'] = self
+
+    def load_manifest(self, app):
+        # no manifest (assets not built, e.g. development): serve the sources
+        try:
+            with open(os.path.join(app.static_folder, DIST, MANIFEST)) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return None
+
+    def urls(self, name):
+        if self.manifest and name in self.manifest:
+            return [url_for('static', filename='{}/{}'.format(DIST, self.manifest[name]))]
+        return [url_for('static', filename=source) for source in BUNDLES[name]]
+
+    def send_dist(self, filename):
+        # bundles never change under a given name: cache them for good, and
+        # send the precompressed sibling the client accepts
+        if os.path.basename(filename) == MANIFEST:
+            abort(404)
+        dist = os.path.join(current_app.static_folder, DIST)
+        accepted = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[encoding] and os.path.isfile(os.path.join(dist, filename + suffix)):
+                response = send_from_directory(dist, filename + suffix, mimetype=mimetypes.guess_type(filename)[0])
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = send_from_directory(dist, filename)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+
+assets_command = AppGroup('assets', help='Static asset bundles.')
+
+
+@assets_command.command('build')
+@with_appcontext
+def build_command():
+    """Concatenate, minify, fingerprint and precompress the asset bundles."""
+    manifest = build(current_app.static_folder)
+    for name, filename in manifest.items():
+        size = os.path.getsize(os.path.join(current_app.static_folder, DIST, filename))
+        click.echo('{} -> {}/{} ({} bytes)'.format(name, DIST, filename, size))
+    for warning in fallback_warnings():
+        click.echo('warning: ' + warning, err=True)
+
+
+def fallback_warnings():
+    # optional packages (pinned in requirements.txt) the build ran without
+    warnings = []
+    if rcssmin is None:
+        warnings.append('rcssmin is not installed, CSS was minified with a simple fallback')
+    if rjsmin is None:
+        warnings.append('rjsmin is not installed, JavaScript was only concatenated, not minified')
+    if brotli is None:
+        warnings.append('brotli is not installed, only .gz files were written')
+    return warnings
@@ -0,0 +1,45 @@
+"""Requests/sec of the /api/v1 JSON routes against the matching HTML routes.
+
+Runs against the configured database (or --database-url) through the Flask
+test client, so it measures the application rather than the network.
+
+    python -m benchmarks.api_vs_html --requests 200
+"""
+import argparse
+
+import api
+from app import create_app
+from benchmarks.common import measure, summarize, use_database
+
+PAIRS = [
+    ('/venues', '/api/v1/venues'),
+    ('/artists', '/api/v1/artists'),
+    ('/shows', '/api/v1/shows'),
+    ('/shows', '/api/v1/shows?fields=id,start_time,artist_name,venue_name'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    app = create_app()
+    if args.database_url:
+        use_database(app, args.database_url)
+    client = app.test_client()
+
+    # the API falls back to the stdlib encoder without orjson
+    print('JSON encoder: ' + ('orjson ' + api.orjson.__version__ if api.orjson is not None
+                              else 'json (stdlib; orjson not installed)'))
+    print('{:<60} {:>10} {:>10}'.format('route', 'req/s', 'p95 ms'))
+    for html_url, api_url in PAIRS:
+        for url in (html_url, api_url):
+            measure(client, url, 5)
+            stats = summarize(measure(client, url, args.requests))
+            print('{:<60} {:>10.1f} {:>10.2f}'.format(url, stats['rps'], stats['p95_ms']))
+
+
+if __name__ == '__main__':
+    main()
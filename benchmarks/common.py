@@ -0,0 +1,41 @@
+import time
+
+from dbpool import engine_options
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(client, url, requests, method='get', **kwargs):
+    # latencies in seconds for `requests` sequential calls of one route
+    send = getattr(client, method)
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = send(url, **kwargs)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 500:
+            raise RuntimeError('{} {} -> {}'.format(method.upper(), url, response.status_code))
+    return latencies
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        'requests': len(ordered),
+        'rps': len(ordered) / total if total else 0.0,
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p95_ms': percentile(ordered, 0.95) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000
+    }
+
+
+def use_database(app, url):
+    # point the app at a benchmark database before its engine is created
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
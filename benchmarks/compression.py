@@ -0,0 +1,59 @@
+"""Bytes on the wire and CPU cost of response compression.
+
+Requests the large pages through the Flask test client with no
+Accept-Encoding, then gzip and brotli (when installed) at a few levels,
+and reports the response size and CPU milliseconds per request.
+
+    python -m benchmarks.compression --database-url sqlite:////tmp/fyyur-bench.db
+"""
+import argparse
+import os
+import time
+
+from app import create_app
+from benchmarks.common import use_database
+import compress
+
+URLS = ['/shows', '/artists', '/venues', '/api/v1/shows', '/api/v1/venues?limit=200']
+LEVELS = [1, 6, 9]
+
+
+def cpu_per_request(client, url, headers, requests):
+    # process CPU time, so waiting on the database does not count
+    sizes = set()
+    started = time.process_time()
+    for _ in range(requests):
+        sizes.add(len(client.get(url, headers=headers).data))
+    return (time.process_time() - started) / requests * 1000, max(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=os.environ.get(
+        'BENCH_DATABASE_URL', 'sqlite:////tmp/fyyur-bench.db'))
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app()
+    use_database(app, args.database_url)
+    middleware = app.extensions['compression'].middleware
+    client = app.test_client()
+
+    encodings = ['gzip'] + (['br'] if compress.brotli is not None else [])
+    print('{:<28} {:<9} {:>5} {:>10} {:>7} {:>10}'.format(
+        'url', 'encoding', 'level', 'bytes', 'ratio', 'cpu ms'))
+    for url in URLS:
+        client.get(url)
+        identity_ms, identity_size = cpu_per_request(client, url, {}, args.requests)
+        print('{:<28} {:<9} {:>5} {:>10} {:>7.2f} {:>10.2f}'.format(
+            url, 'identity', '-', identity_size, 1.0, identity_ms))
+        for encoding in encodings:
+            for level in LEVELS:
+                middleware.levels = dict.fromkeys(middleware.levels, level)
+                ms, size = cpu_per_request(client, url, {'Accept-Encoding': encoding}, args.requests)
+                print('{:<28} {:<9} {:>5} {:>10} {:>7.2f} {:>10.2f}'.format(
+                    url, encoding, level, size, size / float(identity_size), ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Requests/sec of the read routes under sync and gevent gunicorn workers.
+
+Runs one gunicorn worker of each class (see gunicorn.conf.py) and loads the
+read routes at increasing client concurrency. Only PostgreSQL (through
+psycogreen) yields while a query runs, so use a seeded PostgreSQL database;
+on SQLite both worker classes serialise on the driver.
+
+    python -m benchmarks.concurrency --database-url postgresql://localhost/fyyur_bench
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.servers import free_port, wait_for, load
+
+URLS = ['/venues', '/venues/1', '/artists/1', '/shows']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=os.environ.get(
+        'BENCH_DATABASE_URL', 'sqlite:////tmp/fyyur-bench.db'))
+    parser.add_argument('--concurrency', type=int, action='append',
+                        help='Client threads, repeatable (default 1, 8, 32).')
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    print('{:<8} {:>5} {:<12} {:>10} {:>9} {:>9}'.format(
+        'worker', 'conc', 'url', 'req/s', 'p50 ms', 'p95 ms'))
+    for worker_class in ('sync', 'gevent'):
+        port = free_port()
+        env = dict(os.environ, DATABASE_URL=args.database_url, WORKER_CLASS=worker_class,
+                   WEB_CONCURRENCY='1', DB_POOL_SIZE='20', DB_MAX_OVERFLOW='20')
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+             '--bind', '127.0.0.1:{}'.format(port), 'wsgi:app'],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for(port)
+            base = 'http://127.0.0.1:{}'.format(port)
+            for concurrency in args.concurrency or [1, 8, 32]:
+                for path in URLS:
+                    load(base, path, concurrency, concurrency)
+                    stats = load(base, path, args.requests, concurrency)
+                    print('{:<8} {:>5} {:<12} {rps:>10.1f} {p50_ms:>9.2f} {p95_ms:>9.2f}'.format(
+                        worker_class, concurrency, path, **stats))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Per-call cost of the `datetime` template filter on a 10k-show page.
+
+Compares the previous filter (show start times stringified by show_info()
+and re-parsed with dateutil on every call) with the current one (native
+datetimes, memoized babel patterns).
+
+    python -m benchmarks.datetime_filter --shows 10000 --repeat 5
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import babel.dates
+import dateutil.parser
+from jinja2 import Environment
+
+from app import format_datetime
+
+PAGE = '{% for show in shows %}<h4>{{ show.start_time|datetime(format) }}</h4>{% endfor %}'
+
+
+def legacy_format_datetime(value, format='medium'):
+    date = dateutil.parser.parse(value)
+    if format == 'full':
+        format = "EEEE MMMM, d, y 'at' h:mma"
+    elif format == 'medium':
+        format = "EE MM, dd, y h:mma"
+    return babel.dates.format_datetime(date, format)
+
+
+def render_seconds(filter_func, shows, format, repeat):
+    env = Environment()
+    env.filters['datetime'] = filter_func
+    template = env.from_string(PAGE)
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        template.render(shows=shows, format=format)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--format', default='full')
+    args = parser.parse_args()
+
+    start = datetime(2020, 6, 1, 20, 0)
+    times = [start + timedelta(hours=i) for i in range(args.shows)]
+    native = [{'start_time': x} for x in times]
+    strings = [{'start_time': str(x)} for x in times]
+
+    assert legacy_format_datetime(strings[0]['start_time'], args.format) == \
+        format_datetime(native[0]['start_time'], args.format)
+
+    before = render_seconds(legacy_format_datetime, strings, args.format, args.repeat)
+    after = render_seconds(format_datetime, native, args.format, args.repeat)
+    for label, seconds in (('before', before), ('after', after)):
+        print('{:<7} {:8.1f} ms/page {:8.2f} us/call'.format(
+            label, seconds * 1000, seconds / args.shows * 1e6))
+    print('speedup {:.1f}x'.format(before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Start-up time and first-request latency of a fresh worker.
+
+Each mode runs in a new interpreter, like a worker after a deploy or a
+max_requests recycle, and times create_app() and then the first request
+to every page (the first request of each template compiles it unless it
+was warmed up):
+
+    cold      no bytecode cache, no warm-up
+    bytecode  compiled templates loaded from the bytecode cache
+    warmup    bytecode cache plus compiling everything at start-up (wsgi.py)
+
+    python -m benchmarks.first_request --database-url sqlite:////tmp/fyyur-bench.db
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+URLS = ['/', '/venues', '/venues/1', '/venues/create', '/artists', '/artists/1',
+        '/artists/create', '/shows', '/shows/create']
+
+MODES = [
+    ('cold', {'TEMPLATE_BYTECODE_CACHE': '0', 'TEMPLATE_WARMUP': '0'}),
+    ('bytecode', {'TEMPLATE_WARMUP': '0'}),
+    ('warmup', {'TEMPLATE_WARMUP': '1'}),
+]
+
+
+def child(database_url):
+    # one fresh worker: JSON timings on stdout
+    started = time.perf_counter()
+    from app import create_app
+    from benchmarks.common import use_database
+    from extensions import templates
+    app = create_app()
+    templates.warm_up(app)
+    use_database(app, database_url)
+    timings = {'startup': time.perf_counter() - started}
+    client = app.test_client()
+    for url in URLS:
+        started = time.perf_counter()
+        client.get(url)
+        timings[url] = time.perf_counter() - started
+    print(json.dumps(timings))
+
+
+def run(mode_env, database_url, cache_dir):
+    env = dict(os.environ, TEMPLATE_CACHE_DIR=cache_dir, FLASK_DEBUG='0')
+    env.update(mode_env)
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.first_request', '--child', '--database-url', database_url],
+        env=env, stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=os.environ.get(
+        'BENCH_DATABASE_URL', 'sqlite:////tmp/fyyur-bench.db'))
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh workers per mode.')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.database_url)
+        return
+
+    cache_dir = tempfile.mkdtemp(prefix='fyyur-bench-templates-')
+    run(MODES[1][1], args.database_url, cache_dir)  # fill the bytecode cache
+    results = {}
+    for name, mode_env in MODES:
+        runs = [run(mode_env, args.database_url, cache_dir) for _ in range(args.repeat)]
+        # median of the fresh workers, per measurement
+        results[name] = {key: sorted(run[key] for run in runs)[len(runs) // 2] for key in runs[0]}
+
+    print('{:<20}'.format('ms') + ''.join('{:>10}'.format(name) for name, _ in MODES))
+    for key in ['startup'] + URLS:
+        print('{:<20}'.format(key) + ''.join(
+            '{:>10.1f}'.format(results[name][key] * 1000) for name, _ in MODES))
+    first_page = lambda name: sum(results[name][url] for url in URLS) * 1000
+    print('{:<20}'.format('all first requests') + ''.join(
+        '{:>10.1f}'.format(first_page(name)) for name, _ in MODES))
+
+
+if __name__ == '__main__':
+    main()
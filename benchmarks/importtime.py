@@ -0,0 +1,86 @@
+"""Cold import cost of the app, from `python -X importtime`.
+
+Imports a module (app by default) in a fresh interpreter, prints the
+slowest top-level imports and fails when the total goes over --budget-ms
+or when a module meant to be imported lazily (babel, dateutil, alembic,
+WTForms) is pulled in at import time.
+
+    python -m benchmarks.importtime --budget-ms 600
+    python -m benchmarks.importtime --module wsgi --top 20
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+LAZY = ['babel', 'dateutil', 'alembic', 'flask_migrate', 'wtforms', 'flask_wtf', 'forms']
+BUDGET_MS = 600.0
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_line = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def import_times(module):
+    # [(cumulative us, self us, depth, name)] in import order
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True, cwd=ROOT)
+    times = []
+    for line in result.stderr.splitlines():
+        match = _line.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append((int(cumulative_us), int(self_us), (len(indent) - 1) // 2, name))
+    return times
+
+
+def fastest(module, repeat):
+    # the run with the least total import time, to smooth out noise
+    runs = [import_times(module) for _ in range(repeat)]
+    return min(runs, key=total_ms)
+
+
+def total_ms(times):
+    return sum(self_us for _, self_us, _, _ in times) / 1000.0
+
+
+def eager_imports(times):
+    # LAZY modules imported anyway
+    imported = {name.split('.')[0] for _, _, _, name in times}
+    return [name for name in LAZY if name in imported]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs to take the fastest of.')
+    args = parser.parse_args()
+
+    times = fastest(args.module, args.repeat)
+    total = total_ms(times)
+
+    # imports made directly by the module, slowest first
+    print('{:<40} {:>10}'.format('imported by ' + args.module, 'ms'))
+    direct = sorted((t for t in times if t[2] == 1), reverse=True)
+    for cumulative_us, _, _, name in direct[:args.top]:
+        print('{:<40} {:>10.1f}'.format(name, cumulative_us / 1000.0))
+    print('{:<40} {:>10.1f}  (budget {:.0f})'.format('total', total, args.budget_ms))
+
+    failures = []
+    if total > args.budget_ms:
+        failures.append('import of {} took {:.1f}ms, budget is {:.0f}ms'.format(
+            args.module, total, args.budget_ms))
+    eager = eager_imports(times)
+    if eager and args.module == 'app':
+        failures.append('imported eagerly: ' + ', '.join(eager))
+    for failure in failures:
+        print('OVER BUDGET ' + failure)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
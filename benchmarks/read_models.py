@@ -0,0 +1,69 @@
+"""Memory and latency of ORM entities against read-model rows, per 10k rows.
+
+Loads the same artists three ways: full Artist entities (what the listing
+and search used to load), bare column tuples, and the NameRow read model.
+Reports the fetch time and, with tracemalloc, the memory held by the
+result and the peak while building it.
+
+    python -m benchmarks.read_models --database-url sqlite:////tmp/fyyur-bench.db
+"""
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+
+from app import create_app
+from models import db, Artist
+from readmodels import NameRow, columns, as_rows
+from benchmarks.common import use_database
+
+LOADERS = [
+    ('entities', lambda n: Artist.query.order_by(Artist.id).limit(n).all()),
+    ('tuples', lambda n: db.session.query(*columns(Artist, NameRow)).order_by(Artist.id).limit(n).all()),
+    ('NameRow', lambda n: as_rows(NameRow, db.session.query(*columns(Artist, NameRow))
+                                  .order_by(Artist.id).limit(n))),
+]
+
+
+def measure(load, rows, repeat):
+    # best fetch seconds, and retained/peak bytes of one fresh load
+    best = None
+    for _ in range(repeat):
+        db.session.remove()
+        started = time.perf_counter()
+        load(rows)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    result = load(rows)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, retained, peak, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=os.environ.get(
+        'BENCH_DATABASE_URL', 'sqlite:////tmp/fyyur-bench.db'))
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    use_database(app, args.database_url)
+    with app.app_context():
+        print('{:<10} {:>7} {:>12} {:>14} {:>12}'.format(
+            'rows as', 'rows', 'ms/10k', 'retained/10k', 'peak/10k'))
+        for name, load in LOADERS:
+            seconds, retained, peak, count = measure(load, args.rows, args.repeat)
+            scale = 10000.0 / max(count, 1)
+            print('{:<10} {:>7} {:>12.2f} {:>12.0f}kB {:>10.0f}kB'.format(
+                name, count, seconds * 1000 * scale, retained * scale / 1024, peak * scale / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Latency and throughput of every HTML route.
+
+Drives each route through the Flask test client against a benchmark
+database, reports p50/p95/p99 latency and requests/sec, and can save the
+numbers as a JSON baseline or compare a run against one (a missing
+baseline fails the comparison; baselines are per machine, `fab baseline`).
+
+    python -m benchmarks.routes --database-url sqlite:////tmp/fyyur-bench.db --seed 10k
+    python -m benchmarks.routes --database-url ... --save-baseline benchmarks/baseline.json
+    python -m benchmarks.routes --database-url ... --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+from app import create_app
+from models import db, Venue, Artist
+from benchmarks.common import measure, summarize, use_database
+from benchmarks.seed import SIZES, seed
+
+
+def routes(max_venue_id, max_artist_id, rng):
+    # (name, method, url or url factory, form data)
+    venue = lambda: '/venues/{}'.format(rng.randint(1, max_venue_id))
+    artist = lambda: '/artists/{}'.format(rng.randint(1, max_artist_id))
+    return [
+        ('index', 'get', '/', None),
+        ('venues', 'get', '/venues', None),
+        ('show_venue', 'get', venue, None),
+        ('search_venues', 'post', '/venues/search', {'search_term': 'club'}),
+        ('create_venue_form', 'get', '/venues/create', None),
+        ('edit_venue', 'get', lambda: venue() + '/edit', None),
+        ('artists', 'get', '/artists', None),
+        ('show_artist', 'get', artist, None),
+        ('search_artists', 'post', '/artists/search', {'search_term': 'band'}),
+        ('create_artist_form', 'get', '/artists/create', None),
+        ('edit_artist', 'get', lambda: artist() + '/edit', None),
+        ('shows', 'get', '/shows', None),
+        ('create_shows', 'get', '/shows/create', None),
+    ]
+
+
+def run(app, requests, warmup, rng):
+    client = app.test_client()
+    with app.app_context():
+        max_venue_id = db.session.query(db.func.max(Venue.id)).scalar() or 1
+        max_artist_id = db.session.query(db.func.max(Artist.id)).scalar() or 1
+
+    results = {}
+    for name, method, url, data in routes(max_venue_id, max_artist_id, rng):
+        kwargs = {'data': data} if data else {}
+        latencies = []
+        for i in range(warmup + requests):
+            sample = measure(client, url() if callable(url) else url, 1, method, **kwargs)
+            if i >= warmup:
+                latencies += sample
+        results[name] = summarize(latencies)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # regressions: p95 slower or throughput lower by more than tolerance
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if stats['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append('{}: p95 {:.2f}ms -> {:.2f}ms'.format(
+                name, before['p95_ms'], stats['p95_ms']))
+        if stats['rps'] < before['rps'] * (1 - tolerance):
+            regressions.append('{}: {:.1f} -> {:.1f} req/s'.format(
+                name, before['rps'], stats['rps']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=os.environ.get(
+        'BENCH_DATABASE_URL', 'sqlite:////tmp/fyyur-bench.db'))
+    parser.add_argument('--seed', choices=sorted(SIZES),
+                        help='Seed the (empty) database with this preset first.')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--save-baseline', metavar='PATH')
+    parser.add_argument('--compare', metavar='PATH')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before --compare fails (0.25 = 25%%).')
+    args = parser.parse_args()
+
+    app = create_app()
+    use_database(app, args.database_url)
+    if args.seed:
+        with app.app_context():
+            try:
+                seed(*SIZES[args.seed])
+            except RuntimeError as e:
+                print('not seeding: {}'.format(e))
+
+    results = run(app, args.requests, args.warmup, random.Random(7))
+
+    print('{:<20} {:>10} {:>9} {:>9} {:>9}'.format('route', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms'))
+    for name, stats in results.items():
+        print('{:<20} {rps:>10.1f} {p50_ms:>9.2f} {p95_ms:>9.2f} {p99_ms:>9.2f}'.format(name, **stats))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('baseline written to ' + args.save_baseline)
+
+    if args.compare:
+        if not os.path.exists(args.compare):
+            # passing without comparing would let any regression through
+            print('no baseline at {}: record one on this machine with '
+                  '--save-baseline {}'.format(args.compare, args.compare))
+            sys.exit(1)
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
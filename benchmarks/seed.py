@@ -0,0 +1,114 @@
+"""Fill an empty database with synthetic venues, artists and shows.
+
+    python -m benchmarks.seed --database-url sqlite:////tmp/fyyur-bench.db --size 10k
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from itertools import islice
+
+from models import db, Venue, Artist, Show
+from counters import refresh_counters
+
+# --size presets: (venues, artists, shows)
+SIZES = {
+    '10k': (1000, 2000, 10000),
+    '50k': (5000, 10000, 50000),
+    '1m': (20000, 50000, 1000000)
+}
+
+GENRES = ['Alternative', 'Blues', 'Classical', 'Country', 'Folk', 'Hip-Hop',
+          'Jazz', 'Pop', 'Punk', 'R&B', 'Reggae', 'Rock n Roll', 'Soul']
+CITIES = [('New York', 'NY'), ('San Francisco', 'CA'), ('Austin', 'TX'),
+          ('Chicago', 'IL'), ('Seattle', 'WA'), ('Nashville', 'TN')]
+
+
+def venue_rows(count, rng):
+    for i in range(1, count + 1):
+        city, state = rng.choice(CITIES)
+        yield {
+            'name': 'Venue {} {}'.format(rng.choice(['Hall', 'Club', 'Room', 'Bar']), i),
+            'city': city,
+            'state': state,
+            'address': '{} Main St'.format(i),
+            'phone': '555{:07d}'.format(i),
+            'image_link': 'https://example.com/venues/{}.jpg'.format(i),
+            'facebook_link': 'https://facebook.com/venue{}'.format(i),
+            'genres': rng.sample(GENRES, 2),
+            'website': 'https://venue{}.example.com'.format(i),
+            'seeking_talent': rng.random() < 0.5,
+            'seeking_description': 'Looking for local bands'
+        }
+
+
+def artist_rows(count, rng):
+    for i in range(1, count + 1):
+        city, state = rng.choice(CITIES)
+        yield {
+            'name': 'Artist {} {}'.format(rng.choice(['Band', 'Trio', 'Quartet', 'DJ']), i),
+            'city': city,
+            'state': state,
+            'phone': '555{:07d}'.format(i),
+            'image_link': 'https://example.com/artists/{}.jpg'.format(i),
+            'facebook_link': 'https://facebook.com/artist{}'.format(i),
+            'genres': rng.sample(GENRES, 2),
+            'website': 'https://artist{}.example.com'.format(i),
+            'seeking_venue': rng.random() < 0.5,
+            'seeking_description': 'Booking summer dates'
+        }
+
+
+def show_rows(count, venues, artists, rng):
+    # a year either side of now, so pages have past and upcoming shows
+    now = datetime.now().replace(second=0, microsecond=0)
+    for _ in range(count):
+        yield {
+            'venue_id': rng.randint(1, venues),
+            'artist_id': rng.randint(1, artists),
+            'start_time': now + timedelta(hours=rng.randint(-24 * 365, 24 * 365))
+        }
+
+
+def insert_all(model, rows, chunk_size=5000):
+    insert = model.__table__.insert()
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        db.session.execute(insert, chunk)
+        db.session.commit()
+
+
+def seed(venues, artists, shows, random_seed=42):
+    db.create_all()
+    if db.session.query(Venue.id).first() or db.session.query(Artist.id).first():
+        raise RuntimeError('refusing to seed a database that already has data')
+
+    rng = random.Random(random_seed)
+    insert_all(Venue, venue_rows(venues, rng))
+    insert_all(Artist, artist_rows(artists, rng))
+    insert_all(Show, show_rows(shows, venues, artists, rng))
+    now = datetime.now()
+    refresh_counters(Venue, now=now, all_rows=True)
+    refresh_counters(Artist, now=now, all_rows=True)
+    db.session.commit()
+
+
+def main():
+    from app import create_app
+    from benchmarks.common import use_database
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--size', choices=sorted(SIZES), default='10k')
+    args = parser.parse_args()
+
+    app = create_app()
+    use_database(app, args.database_url)
+    with app.app_context():
+        seed(*SIZES[args.size])
+    print('seeded {} venues, {} artists, {} shows'.format(*SIZES[args.size]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Requests/sec of the Flask dev server against gunicorn (gunicorn.conf.py).
+
+Starts each server on a local port against the same database, sends the
+same requests from --concurrency client threads over HTTP and reports
+throughput and p50/p95 latency per URL. Seed the database first
+(python -m benchmarks.seed) so the pages have something to render.
+
+    python -m benchmarks.servers --database-url sqlite:////tmp/fyyur-bench.db
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+
+from benchmarks.common import summarize
+
+URLS = ['/', '/venues', '/artists', '/shows', '/venues/1', '/artists/1',
+        '/static/css/bootstrap.min.css']
+
+SERVERS = {
+    'dev': [sys.executable, '-m', 'flask', 'run', '--port', '{port}'],
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                 '--bind', '127.0.0.1:{port}', 'wsgi:app']
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('server on port {} did not start'.format(port))
+
+
+def fetch(url):
+    started = time.perf_counter()
+    with urlopen(url) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def load(base, path, requests, concurrency):
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        latencies = list(pool.map(fetch, [base + path] * requests))
+        elapsed = time.perf_counter() - started
+    stats = summarize(latencies)
+    stats['rps'] = requests / elapsed
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=os.environ.get(
+        'BENCH_DATABASE_URL', 'sqlite:////tmp/fyyur-bench.db'))
+    parser.add_argument('--server', choices=sorted(SERVERS), action='append')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_URL=args.database_url, FLASK_APP='app')
+    print('{:<10} {:<32} {:>10} {:>9} {:>9}'.format('server', 'url', 'req/s', 'p50 ms', 'p95 ms'))
+    for name in args.server or sorted(SERVERS):
+        port = free_port()
+        command = [part.format(port=port) for part in SERVERS[name]]
+        server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL)
+        try:
+            wait_for(port)
+            base = 'http://127.0.0.1:{}'.format(port)
+            for path in URLS:
+                load(base, path, args.concurrency, args.concurrency)
+                stats = load(base, path, args.requests, args.concurrency)
+                print('{:<10} {:<32} {rps:>10.1f} {p50_ms:>9.2f} {p95_ms:>9.2f}'.format(
+                    name, path, **stats))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from flask import request
+from sqlalchemy import String, cast, exists, func, literal_column
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from models import db
+
+#----------------------------------------------------------------------------#
+# Genre / state filters for the listing pages.
+#----------------------------------------------------------------------------#
+
+
+def has_genre(model, genre):
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # genres @> ARRAY[genre]::varchar[], served by the GIN index on
+        # genres; the cast keeps both sides varchar[] so the index applies
+        return model.genres.op('@>')(cast(array([genre]), ARRAY(String)))
+    # JSON lists (e.g. SQLite): look through the list, no index
+    values = func.json_each(model.genres).alias('genre_values')
+    return exists().select_from(values).where(literal_column('genre_values.value') == genre)
+
+
+def browse_args():
+    # ?genre=Jazz&state=NY, blank values ignored
+    return request.args.get('genre') or None, request.args.get('state') or None
+
+
+def filter_listing(query, model):
+    genre, state = browse_args()
+    if genre:
+        query = query.filter(has_genre(model, genre))
+    if state:
+        query = query.filter(model.state == state)
+    return query
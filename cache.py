@@ -0,0 +1,198 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import session
+
+#----------------------------------------------------------------------------#
+# Backends.
+#----------------------------------------------------------------------------#
+
+
+class LRUCache(object):
+    # in-process cache, evicts the least recently used entry past max_entries
+    # and drops entries older than ttl seconds on access
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SharedCache(object):
+    # shared between workers through a redis-py style client (get/setex/delete)
+
+    def __init__(self, client, ttl=300, prefix='fyyur:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @property
+    def evictions(self):
+        # the server evicts on its own; only the local stand-in reports a count
+        return getattr(self.client, 'evictions', 0)
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return None if value is None else value.decode('utf-8')
+
+    def set(self, key, value):
+        self.client.setex(self.prefix + key, self.ttl, value.encode('utf-8'))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+    def clear(self):
+        keys = list(self.client.scan_iter(self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+class LocalSharedClient(object):
+    # single-process stand-in for a redis server, for development and tests
+
+    def __init__(self):
+        self.evictions = 0
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                entry = None
+            return None if entry is None else entry[1]
+
+    def setex(self, key, ttl, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def scan_iter(self, match):
+        prefix = match.rstrip('*')
+        return [key for key in list(self._data) if key.startswith(prefix)]
+
+#----------------------------------------------------------------------------#
+# Page cache.
+#----------------------------------------------------------------------------#
+
+
+class PageCache(object):
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('CACHE_BACKEND', 'lru')
+        ttl = app.config.get('CACHE_TTL', 300)
+        if backend == 'lru':
+            self.backend = LRUCache(app.config.get('CACHE_MAX_ENTRIES', 1024), ttl)
+        elif backend == 'redis':
+            import redis
+            client = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+            self.backend = SharedCache(client, ttl)
+        elif backend == 'local':
+            self.backend = SharedCache(LocalSharedClient(), ttl)
+        elif backend != 'null':
+            raise ValueError('Unknown CACHE_BACKEND {!r}'.format(backend))
+        app.extensions['page_cache'] = self
+
+    def cached(self, key, validator=None):
+        # key is a format string filled from the view arguments,
+        # e.g. 'venue:{venue_id}'. With a validator (as for conditional())
+        # entries are tagged with its version and only served while it is
+        # unchanged: invalidate() reaches one worker's LRU only, the version
+        # catches a write made through any other.
+        def decorator(view):
+            @wraps(view)
+            def wrapper(**kwargs):
+                # flashed messages are per user, render those pages fresh
+                if self.backend is None or '_flashes' in session:
+                    return view(**kwargs)
+
+                tag = ''
+                if validator is not None:
+                    version = validator(**kwargs)[1]
+                    if version is None:
+                        return view(**kwargs)
+                    tag = hashlib.sha1(repr(version).encode()).hexdigest()
+
+                cache_key = key.format(**kwargs)
+                entry = self.backend.get(cache_key)
+                if entry is not None:
+                    entry_tag, _, page = entry.partition('\n')
+                    if entry_tag == tag:
+                        self.hits += 1
+                        return page
+
+                self.misses += 1
+                page = view(**kwargs)
+                if isinstance(page, str):
+                    self.backend.set(cache_key, tag + '\n' + page)
+                return page
+            return wrapper
+        return decorator
+
+    def invalidate(self, *keys):
+        if self.backend is not None:
+            self.backend.delete(*keys)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.backend.evictions if self.backend else 0,
+            'size': len(self.backend) if isinstance(self.backend, LRUCache) else None
+        }
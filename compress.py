@@ -0,0 +1,179 @@
+import gzip
+import mimetypes
+import os
+from werkzeug.http import parse_accept_header
+from werkzeug.security import safe_join
+from werkzeug.wrappers import Request, Response
+from werkzeug.wsgi import wrap_file
+from assets import DIST
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+#----------------------------------------------------------------------------#
+# Response compression.
+#----------------------------------------------------------------------------#
+
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level)
+
+
+class CompressionMiddleware(object):
+    # gzip/brotli for buffered responses of the configured content types, and
+    # .gz/.br siblings of static files sent as they are
+
+    def __init__(self, wsgi_app, levels, min_size, static_folder, static_url_path, max_age):
+        self.wsgi_app = wsgi_app
+        self.levels = levels
+        self.min_size = min_size
+        self.static_folder = static_folder
+        self.static_prefix = static_url_path + '/'
+        self.max_age = max_age
+
+    def __call__(self, environ, start_response):
+        encodings = self.accepted(environ)
+        if not encodings:
+            return self.wsgi_app(environ, start_response)
+
+        static = self.precompressed(environ, encodings)
+        if static is not None:
+            return static(environ, start_response)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return self.wsgi_app(environ, start_response)
+
+        state = {}
+
+        def capture(status, headers, exc_info=None):
+            if state.get('returned') or not self.compressible(status, headers):
+                state['passthrough'] = True
+                return start_response(status, headers, exc_info)
+            state.update(status=status, headers=headers, exc_info=exc_info)
+            return self._write_unsupported
+
+        app_iter = self.wsgi_app(environ, capture)
+        state['returned'] = True
+        if 'status' not in state:
+            return app_iter
+
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+        encoding = encodings[0]
+        level = self.levels[self.mimetype(state['headers'])]
+        data = compress(body, encoding, level)
+        headers = [(key, self.weak_etag(value) if key.lower() == 'etag' else value)
+                   for key, value in state['headers']
+                   if key.lower() not in ('content-length', 'vary')]
+        headers += [('Content-Encoding', encoding),
+                    ('Content-Length', str(len(data))),
+                    ('Vary', self.vary(state['headers']))]
+        start_response(state['status'], headers, state['exc_info'])
+        return [data]
+
+    def accepted(self, environ):
+        # encodings the client takes, best first
+        accept = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING'))
+        encodings = ['br'] if brotli is not None and accept['br'] else []
+        if accept['gzip']:
+            encodings.append('gzip')
+        return encodings
+
+    def compressible(self, status, headers):
+        # only complete 200 responses with a known, large enough length: no
+        # streams (no Content-Length), nothing already encoded
+        if not status.startswith('200'):
+            return False
+        headers = {key.lower(): value for key, value in headers}
+        if 'content-encoding' in headers or 'content-length' not in headers:
+            return False
+        if int(headers['content-length']) < self.min_size:
+            return False
+        return self.mimetype(headers.items()) in self.levels
+
+    def mimetype(self, headers):
+        for key, value in headers:
+            if key.lower() == 'content-type':
+                return value.split(';')[0].strip()
+        return None
+
+    @staticmethod
+    def weak_etag(etag):
+        # the encoded body is not byte-identical to what a strong ETag from
+        # upstream (e.g. send_file) names; a weak one still answers
+        # If-None-Match, but not If-Range
+        return etag if etag.startswith('W/') else 'W/' + etag
+
+    def vary(self, headers):
+        vary = [value for key, value in headers if key.lower() == 'vary']
+        return ', '.join(vary + ['Accept-Encoding'])
+
+    @staticmethod
+    def _write_unsupported(data):
+        raise RuntimeError('write() is not supported under compression')
+
+    def precompressed(self, environ, encodings):
+        # a Response for the .br/.gz sibling of a static file, or None;
+        # static/dist is left to the assets route
+        path = environ.get('PATH_INFO', '')
+        if environ['REQUEST_METHOD'] not in ('GET', 'HEAD') or not path.startswith(self.static_prefix):
+            return None
+        filename = path[len(self.static_prefix):]
+        if filename.startswith(DIST + '/'):
+            return None
+        filename = safe_join(self.static_folder, filename)
+        if filename is None or not os.path.isfile(filename):
+            return None
+
+        for encoding in encodings:
+            sibling = filename + SUFFIXES[encoding]
+            if os.path.isfile(sibling):
+                break
+        else:
+            return None
+
+        stat = os.stat(sibling)
+        response = Response(wrap_file(environ, open(sibling, 'rb')),
+                            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                            direct_passthrough=True)
+        response.headers['Content-Encoding'] = encoding
+        response.headers['Content-Length'] = stat.st_size
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.last_modified = stat.st_mtime
+        response.set_etag('{}-{}-{}'.format(int(stat.st_mtime), stat.st_size, encoding))
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        return response.make_conditional(Request(environ))
+
+
+class Compression(object):
+
+    def __init__(self, app=None):
+        self.middleware = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('COMPRESS'):
+            return
+        if brotli is None:
+            app.logger.warning('brotli is not installed: responses are gzip only')
+        self.middleware = CompressionMiddleware(
+            app.wsgi_app,
+            levels=app.config.get('COMPRESS_LEVELS', {'text/html': 6, 'application/json': 6}),
+            min_size=app.config.get('COMPRESS_MIN_SIZE', 1024),
+            static_folder=app.static_folder,
+            static_url_path=app.static_url_path,
+            max_age=int(app.send_file_max_age_default.total_seconds())
+        )
+        app.wsgi_app = self.middleware
+        app.extensions['compression'] = self
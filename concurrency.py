@@ -0,0 +1,28 @@
+from flask import copy_current_request_context, has_request_context
+
+#----------------------------------------------------------------------------#
+# Concurrent queries under gevent workers.
+#----------------------------------------------------------------------------#
+
+
+def cooperative():
+    # True in a gevent worker, see gunicorn.conf.py
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('socket')
+
+
+def gather(*calls):
+    # run independent zero-argument calls concurrently and return their
+    # results in order. Each call gets its own copy of the request context,
+    # so its own session and pooled connection (the SQL profiler does not see
+    # these queries). Outside gevent they simply run one after the other.
+    if len(calls) < 2 or not cooperative() or not has_request_context():
+        return [call() for call in calls]
+
+    import gevent
+    greenlets = [gevent.spawn(copy_current_request_context(call)) for call in calls]
+    gevent.joinall(greenlets, raise_error=True)
+    return [greenlet.value for greenlet in greenlets]
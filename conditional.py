@@ -0,0 +1,67 @@
+import hashlib
+from functools import wraps
+from flask import g, request, session, make_response
+
+#----------------------------------------------------------------------------#
+# Conditional GET (ETag / Last-Modified).
+#----------------------------------------------------------------------------#
+
+
+def _naive_utc(value):
+    if value is not None and value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    return value
+
+
+def not_modified(etag, last_modified, version):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    # If-Modified-Since alone only when the version is nothing but that
+    # timestamp. The validators also count rows and past shows, which change
+    # without moving max(updated_at) (a hard delete, a show starting), so for
+    # them only the ETag can tell the page is unchanged.
+    if version != (last_modified,):
+        return False
+    since = _naive_utc(request.if_modified_since)
+    # HTTP dates have one second resolution
+    return since is not None and last_modified is not None and \
+        last_modified.replace(microsecond=0) <= since
+
+
+def versioned(validator):
+    # validator computed at most once per request for the same arguments, so
+    # conditional() and PageCache.cached() can share one version query
+    def wrapper(**kwargs):
+        results = g.setdefault('page_versions', {})
+        key = (id(validator), tuple(sorted(kwargs.items())))
+        if key not in results:
+            results[key] = validator(**kwargs)
+        return results[key]
+    return wrapper
+
+
+def conditional(validator):
+    # validator(**view_args) -> (last_modified, version), both computed without
+    # rendering; version is any value that changes whenever the page would
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            # a pending flash message must reach the user, never answer 304
+            if '_flashes' in session:
+                return view(**kwargs)
+
+            last_modified, version = validator(**kwargs)
+            if version is None:
+                return view(**kwargs)
+            etag = hashlib.sha1(repr((request.full_path, version)).encode()).hexdigest()
+
+            if not_modified(etag, last_modified, version):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(**kwargs))
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
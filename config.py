@@ -3,11 +3,101 @@ SECRET_KEY = os.urandom(32)
 # Grabs the folder where the script runs (path to the current directory)
 basedir = os.path.abspath(os.path.dirname(__file__))
 
-# Enable debug mode.
-DEBUG = True
+# Enable debug mode (development only, e.g. FLASK_DEBUG=1 flask run).
+DEBUG = os.environ.get('FLASK_DEBUG') == '1'
+
+# Templates: recompile on change only while debugging. Compiled bytecode is
+# cached on disk: by default in Jinja's private per-user directory, or in
+# TEMPLATE_CACHE_DIR, which must be owned by this user with mode 0700.
+# wsgi.py compiles them all before gunicorn forks (TEMPLATE_WARMUP).
+TEMPLATES_AUTO_RELOAD = DEBUG
+TEMPLATE_BYTECODE_CACHE = os.environ.get('TEMPLATE_BYTECODE_CACHE', '1') == '1'
+TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR') or None
+TEMPLATE_WARMUP = os.environ.get('TEMPLATE_WARMUP', '1') == '1'
 
 # Connect to the database
 
-# TODO IMPLEMENT DATABASE URL
-SQLALCHEMY_DATABASE_URI = 'postgresql://postgres@localhost:5432/fyyur'
-SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'postgresql://postgres@localhost:5432/fyyur')
+if SQLALCHEMY_DATABASE_URI.startswith('postgres://'):
+    SQLALCHEMY_DATABASE_URI = 'postgresql://' + SQLALCHEMY_DATABASE_URI[len('postgres://'):]
+SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+# Read replicas (comma separated URIs): GET/HEAD requests and the searches
+# (routing.read_only) read from one of them, except for
+# REPLICA_READ_YOUR_WRITES seconds after the same user submitted a form, so
+# they see their own change despite replication lag
+SQLALCHEMY_REPLICA_URIS = [uri.strip() for uri in
+                           os.environ.get('SQLALCHEMY_REPLICA_URIS', '').split(',') if uri.strip()]
+SQLALCHEMY_BINDS = {'replica_{}'.format(i): uri for i, uri in enumerate(SQLALCHEMY_REPLICA_URIS)}
+REPLICA_READ_YOUR_WRITES = 5
+
+# Connection pool, per process: size it so workers * (DB_POOL_SIZE +
+# DB_MAX_OVERFLOW) stays under the server's max_connections. Connections are
+# recycled before server/firewall idle timeouts and pinged on checkout.
+# SQLALCHEMY_ENGINE_OPTIONS is built from these by dbpool.engine_options.
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1') == '1'
+# Server-side cap on any one statement, 0 to disable
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))
+# Behind PgBouncer: no pooling in the app (NullPool)
+DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER') == '1'
+
+# Listing pages
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Delete buttons retire venues/artists (hide them, keep their shows)
+# instead of deleting them with their shows
+SOFT_DELETE = False
+
+# Maximum results returned by the venue/artist search
+SEARCH_LIMIT = 50
+
+# Detail page cache: 'lru' (per process), 'redis' (shared, needs the redis
+# package and CACHE_REDIS_URL), 'local' (in-process redis stand-in) or 'null'
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'lru')
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+CACHE_MAX_ENTRIES = 1024
+CACHE_TTL = 300
+
+# gzip/brotli compression of responses of these content types (value: gzip
+# level 1-9, also used as brotli quality) that are at least COMPRESS_MIN_SIZE
+# bytes. Turn off when a proxy in front compresses already.
+COMPRESS = os.environ.get('COMPRESS', '1') == '1'
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVELS = {
+    'text/html': 6,
+    'application/json': 6,
+    'text/csv': 6,
+    'text/css': 6,
+    'application/javascript': 6,
+    'image/svg+xml': 6
+}
+
+# /metrics/pool and /metrics/cache (JSON for monitoring) are served only
+# with METRICS_ENDPOINTS=1, otherwise they 404. Keep them off on public
+# instances, or block /metrics/ at the proxy.
+METRICS_ENDPOINTS = os.environ.get('METRICS_ENDPOINTS') == '1'
+
+# Rows per batch/transaction for `flask import`
+IMPORT_CHUNK_SIZE = 1000
+
+# Per-request SQL profiling: Server-Timing header, structured log line and
+# N+1 warnings. With QUERY_BUDGET_STRICT an endpoint running more queries
+# than its budget fails the request (use in tests).
+QUERY_PROFILER = os.environ.get('QUERY_PROFILER') == '1'
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT') == '1'
+QUERY_REPEAT_THRESHOLD = 5
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGETS = {
+    'venues.venues': 2,
+    'venues.show_venue': 3,
+    'venues.search_venues': 1,
+    'artists.artists': 2,
+    'artists.show_artist': 3,
+    'artists.search_artists': 1,
+    'shows.shows': 2
+}
@@ -0,0 +1,56 @@
+from datetime import datetime
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select, and_
+from models import db, Venue, Artist, Show
+
+#----------------------------------------------------------------------------#
+# Upcoming show counters on Venue and Artist.
+#----------------------------------------------------------------------------#
+
+
+def refresh_counters(model, ids=None, now=None, all_rows=False):
+    # recompute upcoming_show_count/next_show_at in one correlated UPDATE, for
+    # the given ids, every row, or by default rows whose next show has started
+    now = now or datetime.now()
+    key = Show.venue_id if model is Venue else Show.artist_id
+    # shows on the other side of a retired venue/artist are not listed
+    other, other_key = (Artist, Show.artist_id) if model is Venue else (Venue, Show.venue_id)
+    active = select([other.id]).where(other.deleted_at.is_(None))
+    upcoming = and_(key == model.id, Show.start_time > now, other_key.in_(active))
+
+    update = model.__table__.update().values(
+        upcoming_show_count=select([func.count(Show.id)]).where(upcoming).as_scalar(),
+        next_show_at=select([func.min(Show.start_time)]).where(upcoming).as_scalar(),
+        updated_at=datetime.utcnow()
+    )
+    if ids is not None:
+        ids = list(set(ids))
+        if not ids:
+            return 0
+        update = update.where(model.id.in_(ids))
+    elif not all_rows:
+        update = update.where(model.next_show_at <= now)
+    return db.session.execute(update).rowcount
+
+
+def refresh_show_counters(venue_ids=None, artist_ids=None):
+    # call after shows change, in the same transaction; the caller commits
+    now = datetime.now()
+    if venue_ids:
+        refresh_counters(Venue, venue_ids, now)
+    if artist_ids:
+        refresh_counters(Artist, artist_ids, now)
+
+
+@click.command('refresh-counters')
+@click.option('--all', 'all_rows', is_flag=True,
+              help='Recompute every row instead of only those with a started show.')
+@with_appcontext
+def refresh_counters_command(all_rows):
+    """Roll started shows from upcoming to past (run periodically, e.g. cron)."""
+    now = datetime.now()
+    for model in (Venue, Artist):
+        click.echo('{}: {} rows refreshed'.format(
+            model.__tablename__, refresh_counters(model, now=now, all_rows=all_rows)))
+    db.session.commit()
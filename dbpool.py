@@ -0,0 +1,93 @@
+import threading
+from sqlalchemy import event
+from sqlalchemy.pool import Pool, NullPool
+
+#----------------------------------------------------------------------------#
+# Connection pool settings and metrics.
+#----------------------------------------------------------------------------#
+
+
+def engine_options(config):
+    # SQLALCHEMY_ENGINE_OPTIONS built from the DB_* settings in config.py
+    if not config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'):
+        return {}
+
+    # psycopg2 sends executemany() INSERTs as multi-row VALUES statements
+    options = {'executemany_mode': 'values'}
+    if config.get('DB_PGBOUNCER'):
+        # PgBouncer (transaction pooling) owns the pool: open a connection per
+        # checkout and keep nothing idle here. psycopg2 never uses server-side
+        # prepared statements, so nothing else breaks behind it. Startup
+        # options are rejected by PgBouncer, set statement_timeout on the role.
+        options['poolclass'] = NullPool
+        return options
+
+    options.update(
+        pool_size=config.get('DB_POOL_SIZE', 5),
+        max_overflow=config.get('DB_MAX_OVERFLOW', 10),
+        pool_timeout=config.get('DB_POOL_TIMEOUT', 30),
+        pool_recycle=config.get('DB_POOL_RECYCLE', 1800),
+        pool_pre_ping=config.get('DB_POOL_PRE_PING', True)
+    )
+    if config.get('DB_STATEMENT_TIMEOUT_MS'):
+        options['connect_args'] = {
+            'options': '-c statement_timeout={}'.format(config['DB_STATEMENT_TIMEOUT_MS'])
+        }
+    return options
+
+
+class PoolMetrics(object):
+    # process-wide counters from the pool events of every engine
+
+    def __init__(self, app=None):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+        if not getattr(PoolMetrics, '_listening', False):
+            event.listen(Pool, 'connect', self._on_connect)
+            event.listen(Pool, 'checkout', self._on_checkout)
+            event.listen(Pool, 'checkin', self._on_checkin)
+            event.listen(Pool, 'invalidate', self._on_invalidate)
+            PoolMetrics._listening = True
+        app.extensions['pool_metrics'] = self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self, engine=None):
+        stats = {
+            'connects': self.connects,
+            'checkouts': self.checkouts,
+            'checkins': self.checkins,
+            'invalidations': self.invalidations,
+            'checked_out': self.checked_out,
+            'max_checked_out': self.max_checked_out
+        }
+        if engine is not None:
+            stats['pool'] = engine.pool.status()
+        return stats
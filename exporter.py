@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+import click
+from flask import Blueprint, Response, request, stream_with_context, abort
+from flask.cli import with_appcontext
+from models import db, Venue, Artist, Show
+
+#----------------------------------------------------------------------------#
+# Show calendar export.
+#----------------------------------------------------------------------------#
+
+exports = Blueprint('exports', __name__)
+
+EXPORT_COLUMNS = ['show_id', 'start_time', 'artist_id', 'artist_name', 'venue_id',
+                  'venue_name', 'venue_city', 'venue_state']
+
+MIMETYPES = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+
+def iter_shows(batch_size=1000):
+    # server-side cursor on PostgreSQL, batch_size rows in memory at a time
+    query = db.session.query(
+        Show.id.label('show_id'),
+        Show.start_time,
+        Artist.id.label('artist_id'),
+        Artist.name.label('artist_name'),
+        Venue.id.label('venue_id'),
+        Venue.name.label('venue_name'),
+        Venue.city.label('venue_city'),
+        Venue.state.label('venue_state')
+    ).join(Artist, Show.artist_id == Artist.id) \
+        .join(Venue, Show.venue_id == Venue.id) \
+        .filter(Artist.deleted_at.is_(None), Venue.deleted_at.is_(None)) \
+        .order_by(Show.start_time, Show.id) \
+        .execution_options(stream_results=True) \
+        .yield_per(batch_size)
+    for row in query:
+        yield row
+
+
+def iter_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([x.isoformat() if isinstance(x, datetime) else x for x in row])
+        if buffer.tell() > 65536:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_jsonl(rows):
+    lines = []
+    for row in rows:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        record['start_time'] = record['start_time'].isoformat()
+        lines.append(json.dumps(record, separators=(',', ':')))
+        if len(lines) == 500:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def iter_gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(format, gzip=False):
+    chunks = (iter_csv if format == 'csv' else iter_jsonl)(iter_shows())
+    return iter_gzip(chunks) if gzip else (chunk.encode('utf-8') for chunk in chunks)
+
+
+@exports.route('/shows/export.<format>')
+def export_shows(format):
+    if format not in MIMETYPES:
+        abort(404)
+    gzip = request.args.get('gzip', type=int) == 1
+    filename = 'shows.{}{}'.format(format, '.gz' if gzip else '')
+    response = Response(stream_with_context(iter_export(format, gzip)),
+                        mimetype='application/gzip' if gzip else MIMETYPES[format])
+    response.headers['Content-Disposition'] = 'attachment; filename=' + filename
+    return response
+
+
+@click.command('export')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--format', 'format', type=click.Choice(sorted(MIMETYPES)),
+              help='Output format, guessed from the file extension by default.')
+@click.option('--gzip', is_flag=True, help='Compress the output.')
+@with_appcontext
+def export_command(path, format, gzip):
+    """Write every show, with artist and venue names, to a CSV/JSONL file."""
+    name = path[:-3] if path.endswith('.gz') else path
+    format = format or ('jsonl' if name.endswith('.jsonl') else 'csv')
+    gzip = gzip or path.endswith('.gz')
+    with open(path, 'wb') as f:
+        for chunk in iter_export(format, gzip):
+            f.write(chunk)
@@ -0,0 +1,47 @@
+from flask_moment import Moment
+from flask import current_app
+from cache import PageCache
+from profiler import QueryProfiler
+from dbpool import PoolMetrics
+from assets import Assets
+from compress import Compression
+from templating import Templates
+
+#----------------------------------------------------------------------------#
+# Flask-Migrate, loaded on first use.
+#----------------------------------------------------------------------------#
+
+
+class LazyMigrate(object):
+    # flask_migrate imports alembic, and with it dateutil, and only `flask db`
+    # needs either: stand in for app.extensions['migrate'] until a migration
+    # command reads it, then hand over to the real Flask-Migrate config
+
+    def __init__(self):
+        self.db = None
+
+    def init_app(self, app, db):
+        self.db = db
+        app.extensions['migrate'] = self
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        from flask_migrate import Migrate
+        app = current_app._get_current_object()
+        Migrate(app, self.db)
+        return getattr(app.extensions['migrate'], name)
+
+
+#----------------------------------------------------------------------------#
+# Extensions, bound to the app in create_app().
+#----------------------------------------------------------------------------#
+
+moment = Moment()
+migrate = LazyMigrate()
+pool_metrics = PoolMetrics()
+page_cache = PageCache()
+profiler = QueryProfiler()
+assets = Assets()
+compression = Compression()
+templates = Templates()
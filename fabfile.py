@@ -7,12 +7,19 @@ from fabric.contrib.console import confirm
 def test():
     with settings(warn_only=True):
         result = local(
-            "python test_tasks.py -v && python test_users.py -v", capture=True
+            "python -m pytest && "
+            "python -m benchmarks.routes --seed 10k --compare benchmarks/baseline.json",
+            capture=True
         )
     if result.failed and not confirm("Tests failed. Continue?"):
         abort("Aborted at user request.")
 
 
+def baseline():
+    # record benchmarks/baseline.json on this machine for test() to compare against
+    local("python -m benchmarks.routes --seed 10k --save-baseline benchmarks/baseline.json")
+
+
 def commit():
     message = raw_input("Enter a git commit message: ")
     local("git add . && git commit -am '{}'".format(message))
@@ -39,9 +46,9 @@ def heroku():
 
 
 def heroku_test():
-    local(
-        "heroku run python test_tasks.py -v && heroku run python test_users.py -v"
-    )
+    # the suite from test(); pytest is not in requirements.txt, so the one-off
+    # dyno installs it first. The tests use their own SQLite database.
+    local('heroku run "pip install pytest && python -m pytest"')
 
 
 def deploy():
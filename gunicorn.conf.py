@@ -0,0 +1,50 @@
+import multiprocessing
+import os
+
+#----------------------------------------------------------------------------#
+# gunicorn settings (gunicorn -c gunicorn.conf.py wsgi:app)
+#----------------------------------------------------------------------------#
+
+bind = os.environ.get('BIND', '0.0.0.0:{}'.format(os.environ.get('PORT', 8000)))
+
+# 2 workers per core plus one; WEB_CONCURRENCY overrides (Heroku sets it)
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# 'sync' serves one request per worker at a time. 'gevent' serves up to
+# worker_connections, each waiting on PostgreSQL without blocking the others;
+# raise DB_POOL_SIZE/DB_MAX_OVERFLOW to match (detail pages hold two
+# connections while their queries run concurrently, see concurrency.py).
+worker_class = os.environ.get('WORKER_CLASS', 'sync')
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 100))
+if worker_class == 'gevent':
+    # patch before the app is preloaded; psycogreen makes psycopg2 yield to
+    # other greenlets while it waits for the server
+    from gevent import monkey
+    monkey.patch_all()
+    if not os.environ.get('DATABASE_URL', '').startswith('sqlite'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+# import app, models and forms once in the master, workers fork from it
+preload_app = True
+
+# recycle workers to cap slow memory growth; the jitter keeps them from
+# restarting all at once
+max_requests = int(os.environ.get('MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('MAX_REQUESTS_JITTER', 100))
+
+# seconds a worker may spend on one request, and to finish it on shutdown
+timeout = int(os.environ.get('TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    # never share pooled connections opened in the master across workers
+    from wsgi import app
+    from models import db
+    with app.app_context():
+        for bind in [None] + list(app.config.get('SQLALCHEMY_BINDS') or ()):
+            db.get_engine(app, bind=bind).dispose()
@@ -0,0 +1,158 @@
+import csv
+import json
+import os
+from datetime import datetime
+from itertools import islice
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.datastructures import MultiDict
+from models import db, Venue, Artist, Show
+from counters import refresh_show_counters
+
+#----------------------------------------------------------------------------#
+# Bulk import.
+#----------------------------------------------------------------------------#
+
+# model and the name of the forms.py class validating its rows
+KINDS = {
+    'venues': (Venue, 'VenueForm'),
+    'artists': (Artist, 'ArtistForm'),
+    'shows': (Show, 'ShowForm')
+}
+
+
+def read_rows(path, format):
+    # yields (line number, row dict) without reading the whole file
+    with open(path, newline='', encoding='utf-8') as f:
+        if format == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_num, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_num, json.loads(line)
+
+
+# what forms.ShowForm.start_time parses
+START_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def to_formdata(row):
+    # same shape request.form has for the create forms
+    formdata = MultiDict()
+    for key, value in row.items():
+        if value is None or value == '' or value is False:
+            # an unchecked checkbox is simply absent from a form post
+            continue
+        if value is True:
+            value = 'y'
+        if key == 'genres' and isinstance(value, str):
+            value = [genre.strip() for genre in value.split(',') if genre.strip()]
+        if key == 'start_time' and isinstance(value, str):
+            # ISO 8601 as written by `flask export`, e.g. 2020-06-01T20:00:00
+            try:
+                value = datetime.fromisoformat(value.strip()).strftime(START_TIME_FORMAT)
+            except ValueError:
+                pass
+        for item in (value if isinstance(value, list) else [value]):
+            formdata.add(key, str(item))
+    return formdata
+
+
+def validate_row(model, form_class, row):
+    # -> (column values, None) or (None, error message)
+    if model is Show and not row.get('start_time'):
+        # ShowForm would fill in its default, the time forms.py was imported
+        return None, 'start_time: This field is required.'
+    form = form_class(formdata=to_formdata(row), meta={'csrf': False})
+    if not form.validate():
+        return None, '; '.join('{}: {}'.format(field, errors[0])
+                               for field, errors in form.errors.items())
+
+    values = {name: value for name, value in form.data.items()
+              if name in model.__table__.columns}
+    if model is Show:
+        try:
+            values['artist_id'] = int(values['artist_id'])
+            values['venue_id'] = int(values['venue_id'])
+        except ValueError:
+            return None, 'artist_id and venue_id must be integers'
+    return values, None
+
+
+def import_rows(model, form_class, rows, chunk_size):
+    # validates and inserts one chunk per transaction; yields a report per chunk
+    rows = iter(rows)
+    insert = model.__table__.insert()
+    batch_num = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        batch_num += 1
+
+        values = []
+        invalid = []
+        for line_num, row in chunk:
+            row_values, error = validate_row(model, form_class, row)
+            if error:
+                invalid.append((line_num, error))
+            else:
+                values.append(row_values)
+
+        inserted = 0
+        failure = None
+        if values:
+            try:
+                db.session.execute(insert, values)
+                if model is Show:
+                    refresh_show_counters([x['venue_id'] for x in values],
+                                          [x['artist_id'] for x in values])
+                db.session.commit()
+                inserted = len(values)
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                failure = str(getattr(e, 'orig', e)).strip()
+
+        yield {
+            'batch': batch_num,
+            'first_line': chunk[0][0],
+            'last_line': chunk[-1][0],
+            'inserted': inserted,
+            'invalid': invalid,
+            'failure': failure
+        }
+
+
+@click.command('import')
+@click.argument('kind', type=click.Choice(sorted(KINDS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'format', type=click.Choice(['csv', 'jsonl']),
+              help='Input format, guessed from the file extension by default.')
+@click.option('--chunk-size', type=int, help='Rows per INSERT batch/transaction.')
+@with_appcontext
+def import_command(kind, path, format, chunk_size):
+    """Bulk load venues, artists or shows from a CSV or JSONL file."""
+    import forms
+    model, form_name = KINDS[kind]
+    form_class = getattr(forms, form_name)
+    format = format or ('jsonl' if os.path.splitext(path)[1] in ('.jsonl', '.json') else 'csv')
+    chunk_size = chunk_size or current_app.config.get('IMPORT_CHUNK_SIZE', 1000)
+
+    totals = {'inserted': 0, 'invalid': 0, 'failed': 0}
+    for report in import_rows(model, form_class, read_rows(path, format), chunk_size):
+        click.echo('batch {batch} (lines {first_line}-{last_line}): {inserted} inserted, '
+                   '{invalid_count} invalid'.format(invalid_count=len(report['invalid']), **report))
+        for line_num, error in report['invalid']:
+            click.echo('  line {}: {}'.format(line_num, error))
+        if report['failure']:
+            click.echo('  batch rolled back: {}'.format(report['failure']))
+            totals['failed'] += 1
+        totals['inserted'] += report['inserted']
+        totals['invalid'] += len(report['invalid'])
+
+    click.echo('{inserted} {kind} inserted, {invalid} invalid rows, {failed} failed batches'.format(
+        kind=kind, **totals))
@@ -0,0 +1,33 @@
+"""show and venue lookup indexes
+
+Revision ID: 5b2d9e7c41a8
+Revises: 320338384147
+Create Date: 2026-10-18 09:12:31.204417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2d9e7c41a8'
+down_revision = '320338384147'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # detail pages: a venue's/artist's shows in start_time order
+    op.create_index('ix_Show_venue_id_start_time', 'Show', ['venue_id', 'start_time'], unique=False)
+    op.create_index('ix_Show_artist_id_start_time', 'Show', ['artist_id', 'start_time'], unique=False)
+    # /shows keyset pagination on (start_time, id)
+    op.create_index('ix_Show_start_time_id', 'Show', ['start_time', 'id'], unique=False)
+    # /venues area listing, keyset on (city, state, id)
+    op.create_index('ix_Venue_city_state_id', 'Venue', ['city', 'state', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_Venue_city_state_id', table_name='Venue')
+    op.drop_index('ix_Show_start_time_id', table_name='Show')
+    op.drop_index('ix_Show_artist_id_start_time', table_name='Show')
+    op.drop_index('ix_Show_venue_id_start_time', table_name='Show')
@@ -0,0 +1,35 @@
+"""GIN indexes on venue and artist genres
+
+Revision ID: b5f09e2d7a41
+Revises: f1d6b3a8c274
+Create Date: 2026-10-18 16:21:08.403517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5f09e2d7a41'
+down_revision = 'f1d6b3a8c274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('Venue', 'Artist'):
+        # existing rows: no genres becomes an empty list, blank entries go
+        op.execute(
+            'UPDATE "{table}" SET genres = array_remove(coalesce(genres, \'{{}}\'), \'\') '
+            'WHERE genres IS NULL OR \'\' = ANY(genres)'.format(table=table))
+        op.alter_column(table, 'genres', existing_type=sa.ARRAY(sa.String()),
+                        nullable=False, server_default='{}')
+        op.create_index('ix_{}_genres'.format(table), table, ['genres'], unique=False,
+                        postgresql_using='gin')
+
+
+def downgrade():
+    for table in ('Artist', 'Venue'):
+        op.drop_index('ix_{}_genres'.format(table), table_name=table)
+        op.alter_column(table, 'genres', existing_type=sa.ARRAY(sa.String()),
+                        nullable=True, server_default=None)
@@ -0,0 +1,30 @@
+"""updated_at columns for conditional GET validators
+
+Revision ID: c4e81b07f3d2
+Revises: a93f0c6d2e15
+Create Date: 2026-10-18 11:26:05.918342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e81b07f3d2'
+down_revision = 'a93f0c6d2e15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # existing rows start out as modified at migration time
+    for table in ('Venue', 'Artist', 'Show'):
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=False,
+                                       server_default=sa.text("(now() at time zone 'utc')")))
+        op.create_index('ix_{}_updated_at'.format(table), table, ['updated_at'], unique=False)
+
+
+def downgrade():
+    for table in ('Show', 'Artist', 'Venue'):
+        op.drop_index('ix_{}_updated_at'.format(table), table_name=table)
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,29 @@
+"""venue city and state not null
+
+Revision ID: d3a7c1e90b54
+Revises: b5f09e2d7a41
+Create Date: 2026-10-18 16:21:07.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7c1e90b54'
+down_revision = 'b5f09e2d7a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /venues pages by keyset on (city, state, id), which skips nulls
+    op.execute('''UPDATE "Venue" SET city = coalesce(city, ''), state = coalesce(state, '') '''
+               'WHERE city IS NULL OR state IS NULL')
+    op.alter_column('Venue', 'city', existing_type=sa.String(length=120), nullable=False)
+    op.alter_column('Venue', 'state', existing_type=sa.String(length=120), nullable=False)
+
+
+def downgrade():
+    op.alter_column('Venue', 'state', existing_type=sa.String(length=120), nullable=True)
+    op.alter_column('Venue', 'city', existing_type=sa.String(length=120), nullable=True)
@@ -0,0 +1,37 @@
+"""cascade show deletes, soft delete columns
+
+Revision ID: e7a2c95b1f60
+Revises: c4e81b07f3d2
+Create Date: 2026-10-18 12:40:19.334861
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2c95b1f60'
+down_revision = 'c4e81b07f3d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # deleting a venue or artist removes its shows in the same statement
+    op.drop_constraint('Show_artist_id_fkey', 'Show', type_='foreignkey')
+    op.drop_constraint('Show_venue_id_fkey', 'Show', type_='foreignkey')
+    op.create_foreign_key('Show_artist_id_fkey', 'Show', 'Artist', ['artist_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('Show_venue_id_fkey', 'Show', 'Venue', ['venue_id'], ['id'], ondelete='CASCADE')
+
+    op.add_column('Venue', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('Artist', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('Artist', 'deleted_at')
+    op.drop_column('Venue', 'deleted_at')
+
+    op.drop_constraint('Show_venue_id_fkey', 'Show', type_='foreignkey')
+    op.drop_constraint('Show_artist_id_fkey', 'Show', type_='foreignkey')
+    op.create_foreign_key('Show_venue_id_fkey', 'Show', 'Venue', ['venue_id'], ['id'])
+    op.create_foreign_key('Show_artist_id_fkey', 'Show', 'Artist', ['artist_id'], ['id'])
@@ -0,0 +1,38 @@
+"""upcoming show counters on venue and artist
+
+Revision ID: f1d6b3a8c274
+Revises: e7a2c95b1f60
+Create Date: 2026-10-18 13:52:40.117092
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1d6b3a8c274'
+down_revision = 'e7a2c95b1f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table, key in (('Venue', 'venue_id'), ('Artist', 'artist_id')):
+        op.add_column(table, sa.Column('upcoming_show_count', sa.Integer(), nullable=False,
+                                       server_default='0'))
+        op.add_column(table, sa.Column('next_show_at', sa.DateTime(), nullable=True))
+        op.create_index('ix_{}_next_show_at'.format(table), table, ['next_show_at'], unique=False)
+        op.execute(
+            'UPDATE "{table}" SET '
+            'upcoming_show_count = (SELECT count(*) FROM "Show" '
+            'WHERE "Show".{key} = "{table}".id AND "Show".start_time > now()), '
+            'next_show_at = (SELECT min(start_time) FROM "Show" '
+            'WHERE "Show".{key} = "{table}".id AND "Show".start_time > now())'.format(
+                table=table, key=key))
+
+
+def downgrade():
+    for table in ('Artist', 'Venue'):
+        op.drop_index('ix_{}_next_show_at'.format(table), table_name=table)
+        op.drop_column(table, 'next_show_at')
+        op.drop_column(table, 'upcoming_show_count')
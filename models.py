@@ -1,29 +1,44 @@
-from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_moment import Moment
+from datetime import datetime
+from routing import RoutingSQLAlchemy
 #----------------------------------------------------------------------------#
 # App Config.
 #----------------------------------------------------------------------------#
-db = SQLAlchemy()
+db = RoutingSQLAlchemy()
+
+# ARRAY is PostgreSQL only; store JSON lists on SQLite test databases
+GENRES = db.ARRAY(db.String).with_variant(db.JSON, 'sqlite')
 
 
 class Venue(db.Model):
     __tablename__ = 'Venue'
+    __table_args__ = (
+        db.Index('ix_Venue_city_state_id', 'city', 'state', 'id'),
+        db.Index('ix_Venue_updated_at', 'updated_at'),
+        db.Index('ix_Venue_next_show_at', 'next_show_at'),
+        db.Index('ix_Venue_name_trgm', 'name',
+                 postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('ix_Venue_genres', 'genres', postgresql_using='gin'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String)
-    city = db.Column(db.String(120))
-    state = db.Column(db.String(120))
+    # never null: /venues pages by keyset on (city, state, id)
+    city = db.Column(db.String(120), nullable=False)
+    state = db.Column(db.String(120), nullable=False)
     address = db.Column(db.String(120))
     phone = db.Column(db.String(120))
     image_link = db.Column(db.String(500))
     facebook_link = db.Column(db.String(120))
-    genres = db.Column(db.ARRAY(db.String))
+    genres = db.Column(GENRES, nullable=False, default=list)
     website = db.Column(db.String(120))
     seeking_talent = db.Column(db.Boolean, default= False)
     seeking_description = db.Column(db.String(500), default= '')
-    shows = db.relationship('Show', backref='Venue', lazy='dynamic')
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime)
+    # maintained by counters.refresh_show_counters()
+    upcoming_show_count = db.Column(db.Integer, nullable=False, default=0)
+    next_show_at = db.Column(db.DateTime)
+    shows = db.relationship('Show', backref='Venue', lazy='dynamic', passive_deletes=True)
 
     def __repr__(self):
         return f'<Venue Id: {self.id} Name: {self.name}>'
@@ -45,11 +60,27 @@ class Venue(db.Model):
         }
 
     def delete(self):
+        # its shows go in the same transaction, one statement for all of them;
+        # only flushed, the caller commits together with the counter refresh
+        Show.query.filter(Show.venue_id == self.id).delete(synchronize_session=False)
         db.session.delete(self)
-        db.session.commit()
+        db.session.flush()
+
+    def retire(self):
+        # soft delete: hidden from listings and search, shows left untouched;
+        # flushed, the caller commits
+        self.deleted_at = datetime.utcnow()
+        db.session.flush()
 
 class Artist(db.Model):
     __tablename__ = 'Artist'
+    __table_args__ = (
+        db.Index('ix_Artist_updated_at', 'updated_at'),
+        db.Index('ix_Artist_next_show_at', 'next_show_at'),
+        db.Index('ix_Artist_name_trgm', 'name',
+                 postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('ix_Artist_genres', 'genres', postgresql_using='gin'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120))
@@ -58,11 +89,16 @@ class Artist(db.Model):
     phone = db.Column(db.String(120))
     image_link = db.Column(db.String(500))
     facebook_link = db.Column(db.String(120))
-    genres = db.Column(db.ARRAY(db.String))
+    genres = db.Column(GENRES, nullable=False, default=list)
     website = db.Column(db.String(120))
     seeking_venue = db.Column(db.Boolean, default=False)
     seeking_description = db.Column(db.String(500), default= '')
-    shows = db.relationship('Show', backref='Artist', lazy='dynamic')
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime)
+    # maintained by counters.refresh_show_counters()
+    upcoming_show_count = db.Column(db.Integer, nullable=False, default=0)
+    next_show_at = db.Column(db.DateTime)
+    shows = db.relationship('Show', backref='Artist', lazy='dynamic', passive_deletes=True)
 
     def __repr__(self):
         return f'<Artist Id: {self.id} Name: {self.name}>'
@@ -83,29 +119,61 @@ class Artist(db.Model):
         }
 
     def delete(self):
+        # its shows go in the same transaction, one statement for all of them;
+        # only flushed, the caller commits together with the counter refresh
+        Show.query.filter(Show.artist_id == self.id).delete(synchronize_session=False)
         db.session.delete(self)
-        db.session.commit()
+        db.session.flush()
+
+    def retire(self):
+        # soft delete: hidden from listings and search, shows left untouched;
+        # flushed, the caller commits
+        self.deleted_at = datetime.utcnow()
+        db.session.flush()
 
 class Show(db.Model):
     __tablename__ = 'Show'
+    __table_args__ = (
+        db.Index('ix_Show_venue_id_start_time', 'venue_id', 'start_time'),
+        db.Index('ix_Show_artist_id_start_time', 'artist_id', 'start_time'),
+        db.Index('ix_Show_start_time_id', 'start_time', 'id'),
+        db.Index('ix_Show_updated_at', 'updated_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    artist_id = db.Column(db.Integer, db.ForeignKey("Artist.id"), nullable=False)
-    venue_id = db.Column(db.Integer, db.ForeignKey("Venue.id"), nullable=False)
+    artist_id = db.Column(db.Integer, db.ForeignKey("Artist.id", ondelete='CASCADE'), nullable=False)
+    venue_id = db.Column(db.Integer, db.ForeignKey("Venue.id", ondelete='CASCADE'), nullable=False)
     start_time = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
    
     def show_info(self):
         return {
             "id": self.id,
             "artist_id": self.artist_id,
             "venue_id": self.venue_id,
-            "start_time": str(self.start_time),
+            "start_time": self.start_time,
             'artist_name': self.Artist.name,
             'artist_image_link': self.Artist.image_link,
             'venue_name': self.Venue.name,
             'venue_image_link': self.Venue.image_link
         }
 
+    @classmethod
+    def info_query(cls):
+        # show_info() columns for many shows in one joined query
+        return db.session.query(
+            cls.id,
+            cls.artist_id,
+            cls.venue_id,
+            cls.start_time,
+            Artist.name.label('artist_name'),
+            Artist.image_link.label('artist_image_link'),
+            Venue.name.label('venue_name'),
+            Venue.image_link.label('venue_image_link')
+        ).join(Artist, cls.artist_id == Artist.id) \
+            .join(Venue, cls.venue_id == Venue.id) \
+            .order_by(cls.start_time)
+
     def delete(self):
         db.session.delete(self)
-        db.session.commit()
\ No newline at end of file
+        db.session.commit()
@@ -0,0 +1,78 @@
+import base64
+import json
+from collections import namedtuple
+from datetime import datetime
+from flask import request, current_app, abort
+from sqlalchemy import and_, or_
+
+#----------------------------------------------------------------------------#
+# Keyset pagination.
+#----------------------------------------------------------------------------#
+
+# items: rows on this page, after: cursor this page started from,
+# next_cursor: cursor for the following page (None on the last page)
+Page = namedtuple('Page', ['items', 'limit', 'after', 'next_cursor'])
+
+
+def page_args():
+    default = current_app.config.get('PAGE_SIZE', 50)
+    maximum = current_app.config.get('MAX_PAGE_SIZE', 200)
+    limit = request.args.get('limit', default, type=int)
+    return max(1, min(limit, maximum)), request.args.get('after') or None
+
+
+def encode_cursor(values):
+    values = [x.isoformat() if isinstance(x, datetime) else x for x in values]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def cursor_value(column, value):
+    # cursors come back from the client: a value of the wrong type (or null)
+    # would make the database fail the comparison, e.g. id > 'x' on PostgreSQL
+    kind = column.type.python_type
+    if kind is datetime:
+        return datetime.fromisoformat(value)
+    if type(value) is not kind:
+        raise ValueError(value)
+    return value
+
+
+def decode_cursor(cursor, columns):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw.decode())
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [cursor_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        abort(400)
+
+
+def keyset_filter(columns, values):
+    # row-value comparison (c1, c2, ...) > (v1, v2, ...) spelled out portably
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, column > values[i]))
+    return or_(*clauses)
+
+
+def paginate(query, columns, row_type=None):
+    # columns must be NOT NULL and form a unique sort key, e.g. (start_time,
+    # id): the keyset comparison never matches a null, so such rows would be
+    # skipped. Rows are returned as row_type (a namedtuple of the selected
+    # columns) if given
+    limit, after = page_args()
+    if after:
+        query = query.filter(keyset_filter(columns, decode_cursor(after, columns)))
+
+    # fetch one extra row to learn whether another page exists
+    rows = query.order_by(None).order_by(*columns).limit(limit + 1).all()
+    if row_type is not None:
+        rows = [row_type._make(row) for row in rows]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+    return Page(rows, limit, after, next_cursor)
@@ -0,0 +1,104 @@
+from datetime import datetime
+import click
+from flask.cli import with_appcontext
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import Executable, ClauseElement
+from models import db, Venue, Artist, Show
+from browse import has_genre
+from pagination import keyset_filter
+
+#----------------------------------------------------------------------------#
+# EXPLAIN based index checks.
+#----------------------------------------------------------------------------#
+
+
+class explain(Executable, ClauseElement):
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(explain, 'postgresql')
+def compile_explain(element, compiler, **kw):
+    return 'EXPLAIN ' + compiler.process(element.statement, **kw)
+
+
+@compiles(explain, 'sqlite')
+def compile_explain_sqlite(element, compiler, **kw):
+    return 'EXPLAIN QUERY PLAN ' + compiler.process(element.statement, **kw)
+
+
+def venue_listing():
+    return db.session.query(
+        Venue.id,
+        Venue.name,
+        Venue.city,
+        Venue.state,
+        Venue.upcoming_show_count
+    ).filter(Venue.deleted_at.is_(None)) \
+        .filter(keyset_filter([Venue.city, Venue.state, Venue.id], ['', '', 0])) \
+        .order_by(Venue.city, Venue.state, Venue.id) \
+        .limit(51)
+
+
+def genre_listing(model, state=None):
+    # /venues?genre=Jazz&state=NY and /artists?genre=Jazz; the filter alone,
+    # the page order would let the planner walk the sort index instead
+    query = db.session.query(model.id, model.name) \
+        .filter(model.deleted_at.is_(None), has_genre(model, 'Jazz'))
+    if state:
+        query = query.filter(model.state == state)
+    return query
+
+
+def show_listing():
+    return Show.info_query() \
+        .filter(keyset_filter([Show.start_time, Show.id], [datetime.now(), 0])) \
+        .order_by(None).order_by(Show.start_time, Show.id) \
+        .limit(51)
+
+
+# (description, query builder, index the plan must use)
+CHECKS = [
+    ('/venues listing', venue_listing, 'ix_Venue_city_state_id'),
+    ('/shows listing', show_listing, 'ix_Show_start_time_id'),
+    ('/venues?genre=&state=', lambda: genre_listing(Venue, 'NY'), 'ix_Venue_genres'),
+    ('/artists?genre=', lambda: genre_listing(Artist), 'ix_Artist_genres'),
+    ('/venues/<id> shows', lambda: Show.info_query().filter(Show.venue_id == 1),
+        'ix_Show_venue_id_start_time'),
+    ('/artists/<id> shows', lambda: Show.info_query().filter(Show.artist_id == 1),
+        'ix_Show_artist_id_start_time'),
+]
+
+
+def run_checks(checks=CHECKS):
+    results = []
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # small development tables are always cheaper to scan sequentially, so
+        # take that option away to see which index the planner would pick
+        db.session.execute('SET LOCAL enable_seqscan = off')
+    try:
+        for description, build, index in checks:
+            # the plan text is the last column (SQLite adds ids before it)
+            plan = '\n'.join(row[-1] for row in db.session.execute(explain(build().statement)))
+            results.append((description, index, index in plan, plan))
+    finally:
+        db.session.rollback()
+    return results
+
+
+@click.command('check-plans')
+@click.option('--verbose', is_flag=True, help='Print every query plan.')
+@with_appcontext
+def check_plans_command(verbose):
+    """Assert the hot listing/detail queries use their indexes."""
+    if db.engine.dialect.name != 'postgresql':
+        raise click.ClickException('check-plans needs a PostgreSQL database')
+
+    failed = 0
+    for description, index, used, plan in run_checks():
+        click.echo('{} {}: {}'.format('ok  ' if used else 'FAIL', description, index))
+        if verbose or not used:
+            click.echo(plan)
+        failed += not used
+    if failed:
+        raise click.ClickException('{} query plan(s) missed their index'.format(failed))
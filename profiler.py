@@ -0,0 +1,93 @@
+import json
+import re
+import time
+from collections import Counter
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+#----------------------------------------------------------------------------#
+# Per-request SQL profiling.
+#----------------------------------------------------------------------------#
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+_placeholders = re.compile(r'(\?|%\(\w+\)s|:\w+)(\s*,\s*(\?|%\(\w+\)s|:\w+))+')
+_whitespace = re.compile(r'\s+')
+
+
+def statement_shape(statement):
+    # IN (?, ?, ?) and IN (?, ?) are the same shape
+    return _whitespace.sub(' ', _placeholders.sub('?', statement)).strip()
+
+
+class QueryProfiler(object):
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('QUERY_PROFILER'):
+            return
+        self.app = app
+        # on Engine, so every engine db creates (and any bind) is covered;
+        # once per process however many apps create_app() builds
+        if not event.contains(Engine, 'before_cursor_execute', self._before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.extensions['query_profiler'] = self
+
+    def _start(self):
+        g.sql_queries = 0
+        g.sql_seconds = 0.0
+        g.sql_shapes = Counter()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('profiler_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['profiler_started'].pop()
+        if not has_request_context() or 'sql_shapes' not in g:
+            return
+        g.sql_queries += 1
+        g.sql_seconds += time.perf_counter() - started
+        g.sql_shapes[statement_shape(statement)] += 1
+
+    def _finish(self, response):
+        if 'sql_shapes' not in g:
+            return response
+        config = self.app.config
+        threshold = config.get('QUERY_REPEAT_THRESHOLD', 5)
+        repeated = {shape: count for shape, count in g.sql_shapes.items() if count >= threshold}
+        budget = config.get('QUERY_BUDGETS', {}).get(request.endpoint,
+                                                      config.get('QUERY_BUDGET_DEFAULT'))
+
+        response.headers.add('Server-Timing', 'db;dur={:.2f};desc="{} queries"'.format(
+            g.sql_seconds * 1000, g.sql_queries))
+        self.app.logger.info(json.dumps({
+            'event': 'sql_profile',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'queries': g.sql_queries,
+            'db_ms': round(g.sql_seconds * 1000, 2),
+            'budget': budget,
+            'repeated': repeated
+        }))
+
+        if repeated:
+            self.app.logger.warning('possible N+1 in %s: %s', request.endpoint, json.dumps(repeated))
+        if budget is not None and g.sql_queries > budget:
+            message = '{} ran {} queries, budget is {}'.format(request.endpoint, g.sql_queries, budget)
+            if config.get('QUERY_BUDGET_STRICT'):
+                raise QueryBudgetExceeded(message)
+            self.app.logger.warning(message)
+        return response
@@ -0,0 +1,21 @@
+from collections import namedtuple
+
+#----------------------------------------------------------------------------#
+# Read models: plain rows for listing and search pages.
+#----------------------------------------------------------------------------#
+
+# Each holds only the columns its page shows. Queries select those columns
+# (see columns()), so no ORM entities are built: no identity map, no
+# change tracking, no genres/links/descriptions loaded.
+
+VenueRow = namedtuple('VenueRow', ['id', 'name', 'city', 'state', 'num_upcoming_shows'])
+NameRow = namedtuple('NameRow', ['id', 'name'])
+
+
+def columns(model, row_type):
+    # model attributes for the fields of row_type, in field order
+    return [getattr(model, field) for field in row_type._fields]
+
+
+def as_rows(row_type, rows):
+    return [row_type._make(row) for row in rows]
@@ -0,0 +1,83 @@
+import random
+import time
+from flask import current_app, g, request, session, has_request_context
+from flask_sqlalchemy import SQLAlchemy, SignallingSession
+from sqlalchemy import orm
+
+#----------------------------------------------------------------------------#
+# Read-replica routing.
+#----------------------------------------------------------------------------#
+
+READ_METHODS = ('GET', 'HEAD')
+REPLICA_PREFIX = 'replica_'
+
+
+def read_only(view):
+    # marks a view that never writes though it is POSTed to (the searches):
+    # it reads from a replica like a GET and does not count as a write
+    view.read_only = True
+    return view
+
+
+def is_read_request():
+    if request.method in READ_METHODS:
+        return True
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, 'read_only', False)
+
+
+class RoutingSession(SignallingSession):
+    # GET/HEAD requests and read_only views read from a replica, everything
+    # else (writes, CLI commands, flushes) uses the primary
+
+    def __init__(self, db, **options):
+        self._db = db
+        SignallingSession.__init__(self, db, **options)
+
+    def get_bind(self, mapper=None, clause=None):
+        replica = self._replica()
+        if replica is not None:
+            return self._db.get_engine(self.app, bind=replica)
+        return SignallingSession.get_bind(self, mapper, clause)
+
+    def _replica(self):
+        if self._flushing or self.new or self.dirty or self.deleted:
+            return None
+        if not has_request_context() or not is_read_request():
+            return None
+        if 'db_replica' not in g:
+            g.db_replica = self._db.choose_replica(self.app)
+        return g.db_replica
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+
+    def init_app(self, app):
+        app.config.setdefault('REPLICA_READ_YOUR_WRITES', 5)
+        SQLAlchemy.init_app(self, app)
+        app.after_request(self._remember_write)
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def replicas(self, app):
+        return [key for key in app.config.get('SQLALCHEMY_BINDS') or ()
+                if key.startswith(REPLICA_PREFIX)]
+
+    def choose_replica(self, app):
+        # None (primary) while the user's own recent write may not have
+        # reached the replicas yet
+        replicas = self.replicas(app)
+        if not replicas:
+            return None
+        wrote_at = session.get('db_wrote_at')
+        if wrote_at and time.time() - wrote_at < app.config['REPLICA_READ_YOUR_WRITES']:
+            return None
+        return random.choice(replicas)
+
+    def _remember_write(self, response):
+        if response.status_code >= 400 or is_read_request():
+            return response
+        if self.replicas(self.get_app()):
+            session['db_wrote_at'] = time.time()
+        return response
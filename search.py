@@ -0,0 +1,35 @@
+from flask import current_app
+from sqlalchemy import func, case
+from models import db
+from readmodels import NameRow, columns, as_rows
+
+#----------------------------------------------------------------------------#
+# Name search.
+#----------------------------------------------------------------------------#
+
+
+def escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def search_by_name(model, search_term, limit=None, row_type=NameRow):
+    # most relevant first, capped at SEARCH_LIMIT results, as row_type rows
+    limit = limit or current_app.config.get('SEARCH_LIMIT', 50)
+    search_term = search_term.strip()
+    pattern = '%{}%'.format(escape_like(search_term))
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # the pg_trgm GIN index on name serves the ILIKE, similarity() ranks it
+        rank = func.similarity(model.name, search_term)
+    else:
+        # no trigrams (e.g. SQLite): exact match, then prefix, then substring
+        name = func.lower(model.name)
+        rank = case([
+            (name == search_term.lower(), 3),
+            (name.like(escape_like(search_term.lower()) + '%', escape='\\'), 2)
+        ], else_=1)
+
+    return as_rows(row_type, db.session.query(*columns(model, row_type))
+                   .filter(model.name.ilike(pattern, escape='\\'), model.deleted_at.is_(None))
+                   .order_by(rank.desc(), model.id)
+                   .limit(limit))
@@ -0,0 +1,69 @@
+from flask import Blueprint, render_template, request, flash, redirect, url_for
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, Venue, Artist, Show
+from pagination import paginate
+from counters import refresh_show_counters
+from conditional import conditional
+from extensions import page_cache
+from views import show_dict, listing_version, VENUE_PAGE, ARTIST_PAGE
+
+show_pages = Blueprint('shows', __name__)
+
+#----------------------------------------------------------------------------#
+#  Shows
+#----------------------------------------------------------------------------#
+
+# View Shows
+@ show_pages.route('/shows')
+@ conditional(lambda: listing_version(Show, Artist, Venue))
+def shows():
+    shows = Show.info_query().filter(Artist.deleted_at.is_(None), Venue.deleted_at.is_(None))
+    page = paginate(shows, [Show.start_time, Show.id])
+    data = list(map(show_dict, page.items))
+    return render_template('pages/shows.html', shows=data, page=page)
+
+#Create Show Form
+@ show_pages.route('/shows/create')
+def create_shows():
+    from forms import ShowForm
+    # renders form. do not touch.
+    form=ShowForm()
+    return render_template('forms/new_show.html', form=form)
+
+#Create Show
+@ show_pages.route('/shows/create', methods=['POST'])
+def create_show_submission():
+    from forms import ShowForm
+    form=ShowForm(formdata=request.form, meta={"csrf": False})
+
+    # Error Handling
+    if not form.validate():
+        errors = form.errors
+        for error in errors.values():
+            flash( error[0] )
+        return redirect(url_for('.create_shows'))
+
+    error=False
+    data=request.form
+
+    try:
+        new_show=Show(
+            artist_id=data.get('artist_id'),
+            venue_id=data.get('venue_id'),
+            start_time=form.start_time.data
+        )
+        db.session.add(new_show)
+        db.session.flush()
+        # the show and the counters it moves commit together
+        refresh_show_counters([new_show.venue_id], [new_show.artist_id])
+        db.session.commit()
+        page_cache.invalidate(
+            VENUE_PAGE.format(venue_id=new_show.venue_id),
+            ARTIST_PAGE.format(artist_id=new_show.artist_id))
+        # on successful db insert, flash success
+        flash("New show was successfully listed!")
+    except SQLAlchemyError:
+        db.session.rollback()
+        error=True
+        flash('An error occurred. New show could not be listed.')
+    return render_template('pages/home.html')
@@ -0,0 +1,48 @@
+import os
+import stat
+from jinja2 import FileSystemBytecodeCache
+
+#----------------------------------------------------------------------------#
+# Template bytecode cache and warm-up.
+#----------------------------------------------------------------------------#
+
+
+def private_dir(path):
+    # bytecode is loaded with marshal, so whoever can write the directory can
+    # run code in the app: only use one this user owns and nobody else can open
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or \
+            stat.S_IMODE(info.st_mode) != 0o700:
+        raise RuntimeError('TEMPLATE_CACHE_DIR {} must be a directory owned by this '
+                           'user with mode 0700'.format(path))
+    return path
+
+
+class Templates(object):
+
+    def __init__(self, app=None):
+        self.compiled = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # compiled templates on disk, shared by workers and kept across
+        # restarts; entries are keyed on the template source, so edits
+        # never serve stale code. Without TEMPLATE_CACHE_DIR Jinja uses its
+        # own per-user directory, created 0700 and checked the same way.
+        if app.config.get('TEMPLATE_BYTECODE_CACHE', True):
+            cache_dir = app.config.get('TEMPLATE_CACHE_DIR')
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+                private_dir(cache_dir) if cache_dir else None)
+        app.extensions['templates'] = self
+
+    def warm_up(self, app):
+        # compile every page now (before gunicorn forks, with preload_app)
+        # rather than on the first request for each one; called from wsgi.py
+        # so CLI commands do not pay for it
+        if not app.config.get('TEMPLATE_WARMUP') or app.debug:
+            return
+        for name in app.jinja_env.list_templates(extensions=['html']):
+            app.jinja_env.get_template(name)
+            self.compiled += 1
@@ -0,0 +1,88 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+# config.py reads these when create_app() first imports it: every request in
+# the tests is profiled and fails when it goes over its QUERY_BUDGETS entry
+os.environ.setdefault('QUERY_PROFILER', '1')
+os.environ.setdefault('QUERY_BUDGET_STRICT', '1')
+
+from app import create_app
+from models import db, Venue, Artist, Show
+from counters import refresh_counters
+
+#----------------------------------------------------------------------------#
+# Fixtures: the app on a throwaway SQLite database, or on the (empty)
+# PostgreSQL database in TEST_DATABASE_URL, which the tests clear again.
+#----------------------------------------------------------------------------#
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # run from tmp_path so the error.log FileHandler writes there
+    monkeypatch.chdir(tmp_path)
+    app = create_app()
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=os.environ.get('TEST_DATABASE_URL') or
+        'sqlite:///' + str(tmp_path / 'fyyur.db'),
+        SQLALCHEMY_ENGINE_OPTIONS={},
+        SQLALCHEMY_BINDS={},
+        SQLALCHEMY_REPLICA_URIS=[]
+    )
+    with app.app_context():
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            db.session.commit()
+        db.create_all()
+    # no app context held open during the test: each client request pushes
+    # its own, with a fresh g, as in production
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def statements(app):
+    # SQL statements run on the database, cleared with statements.clear()
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = db.get_engine(app)
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture
+def add_venues(app):
+    def add(*args, **kwargs):
+        with app.app_context():
+            _add_venues(*args, **kwargs)
+    return add
+
+
+def _add_venues(count, shows_each=2, city='New York', state='NY'):
+    # count venues, each with one artist and shows_each shows either side of now
+    now = datetime.now()
+    for i in range(count):
+        venue = Venue(name='Venue {}'.format(i), city=city, state=state, genres=['Jazz'])
+        artist = Artist(name='Artist {}'.format(i), city=city, state=state, genres=['Jazz'])
+        db.session.add_all([venue, artist])
+        db.session.flush()
+        for j in range(shows_each):
+            db.session.add(Show(venue_id=venue.id, artist_id=artist.id,
+                                start_time=now + timedelta(days=j - shows_each // 2)))
+    db.session.commit()
+    refresh_counters(Venue, all_rows=True)
+    refresh_counters(Artist, all_rows=True)
+    db.session.commit()
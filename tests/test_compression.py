@@ -0,0 +1,11 @@
+def test_compressed_static_file_gets_a_weak_etag(client):
+    identity = client.get('/static/css/main.css')
+    assert not identity.headers['ETag'].startswith('W/')
+
+    gzipped = client.get('/static/css/main.css', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzipped.headers['ETag'] == 'W/' + identity.headers['ETag']
+
+    revalidated = client.get('/static/css/main.css', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']})
+    assert revalidated.status_code == 304
@@ -0,0 +1,40 @@
+import pytest
+from flask import request
+import concurrency
+from concurrency import gather
+
+
+def fail():
+    raise ValueError('no such venue')
+
+
+def test_gather_runs_calls_in_order_outside_gevent(app):
+    calls = []
+    with app.test_request_context('/venues/1'):
+        results = gather(lambda: calls.append('venue') or 1, lambda: calls.append('shows') or 2)
+    assert results == [1, 2]
+    assert calls == ['venue', 'shows']
+
+
+def test_gather_raises_from_the_serial_fallback(app):
+    with app.test_request_context('/venues/1'):
+        with pytest.raises(ValueError):
+            gather(lambda: 1, fail)
+
+
+@pytest.fixture
+def greenlets(monkeypatch):
+    # run the gevent path without monkey-patching the test process
+    pytest.importorskip('gevent')
+    monkeypatch.setattr(concurrency, 'cooperative', lambda: True)
+
+
+def test_gather_returns_results_in_order_under_gevent(app, greenlets):
+    with app.test_request_context('/venues/1'):
+        assert gather(lambda: request.path, lambda: 2) == ['/venues/1', 2]
+
+
+def test_gather_raises_from_a_greenlet(app, greenlets):
+    with app.test_request_context('/venues/1'):
+        with pytest.raises(ValueError):
+            gather(lambda: 1, fail)
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+import views
+
+
+def revalidate(client, url, response, etag=True):
+    headers = {'If-Modified-Since': response.headers['Last-Modified']}
+    if etag:
+        headers['If-None-Match'] = response.headers['ETag']
+    return client.get(url, headers=headers)
+
+
+def test_unchanged_page_answers_304_on_its_etag(client, add_venues):
+    add_venues(2)
+    first = client.get('/venues/1')
+    assert revalidate(client, '/venues/1', first).status_code == 304
+
+
+def test_hard_delete_is_not_hidden_by_if_modified_since(app, client, add_venues):
+    add_venues(2)
+    first = client.get('/venues')
+    app.config['SOFT_DELETE'] = False
+    client.post('/venues/2')
+    # max(updated_at) of the remaining venues has not moved
+    assert revalidate(client, '/venues', first, etag=False).status_code == 200
+    assert revalidate(client, '/venues', first).status_code == 200
+
+
+def test_show_moving_to_past_is_not_hidden_by_if_modified_since(client, add_venues, monkeypatch):
+    add_venues(1, shows_each=3)  # yesterday, now and tomorrow
+    first = client.get('/venues/1')
+
+    class Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(days=2)
+
+    # the upcoming show has started: no row changed, the past count did
+    monkeypatch.setattr(views, 'datetime', Tomorrow)
+    assert revalidate(client, '/venues/1', first, etag=False).status_code == 200
+    assert revalidate(client, '/venues/1', first).status_code == 200
@@ -0,0 +1,8 @@
+from benchmarks.importtime import BUDGET_MS, fastest, total_ms, eager_imports
+
+
+def test_app_import_is_within_budget_and_lazy():
+    # a fresh interpreter, as for a CLI command or a new worker
+    times = fastest('app', repeat=3)
+    assert eager_imports(times) == []
+    assert total_ms(times) <= BUDGET_MS
@@ -0,0 +1,20 @@
+def test_pool_metrics_are_off_by_default(client):
+    assert client.get('/metrics/pool').status_code == 404
+
+
+def test_pool_metrics_when_enabled(app, client):
+    app.config['METRICS_ENDPOINTS'] = True
+    response = client.get('/metrics/pool')
+    assert response.status_code == 200
+    assert response.is_json
+
+
+def test_cache_metrics_are_off_by_default(client):
+    assert client.get('/metrics/cache').status_code == 404
+
+
+def test_cache_metrics_when_enabled(app, client):
+    app.config['METRICS_ENDPOINTS'] = True
+    response = client.get('/metrics/cache')
+    assert response.status_code == 200
+    assert response.is_json
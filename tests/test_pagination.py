@@ -0,0 +1,42 @@
+import base64
+import json
+import re
+import pytest
+
+
+def cursor(values):
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('values', [
+    ['New York', 'NY', 'x'],
+    ['New York', 'NY', None],
+    ['New York', 'NY', True],
+    ['New York', 'NY', 1.5],
+    [1, 'NY', 1],
+    [None, 'NY', 1],
+    ['New York', 'NY'],
+])
+def test_tampered_venue_cursor_is_a_bad_request(client, add_venues, values):
+    add_venues(3)
+    assert client.get('/venues?limit=1&after=' + cursor(values)).status_code == 400
+
+
+@pytest.mark.parametrize('values', [['tomorrow', 1], [1, 1], ['2030-01-01T00:00:00', '1']])
+def test_tampered_show_cursor_is_a_bad_request(client, add_venues, values):
+    add_venues(1)
+    assert client.get('/api/v1/shows?after=' + cursor(values)).status_code == 400
+
+
+def test_venue_pages_cover_every_venue(client, add_venues):
+    add_venues(3, city='New York', state='NY')
+    add_venues(2, city='', state='')
+    add_venues(2, city='Austin', state='TX')
+    seen, url = [], '/venues?limit=2'
+    while url:
+        page = client.get(url).get_data(as_text=True)
+        seen += re.findall(r'href="/venues/(\d+)"', page)
+        next_page = re.search(r'href="(/venues\?[^"]*after=[^"]*)"', page)
+        url = next_page and next_page.group(1).replace('&amp;', '&')
+    assert sorted(seen, key=int) == [str(i) for i in range(1, 8)]
@@ -0,0 +1,28 @@
+import pytest
+from profiler import QueryBudgetExceeded
+
+BUDGETED = ['/venues', '/venues/1', '/artists', '/artists/1', '/shows']
+
+
+@pytest.mark.parametrize('url', BUDGETED)
+def test_routes_stay_within_their_query_budget(client, add_venues, url):
+    add_venues(10)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'db;dur=' in response.headers['Server-Timing']
+
+
+@pytest.mark.parametrize('url,data', [
+    ('/venues/search', {'search_term': 'Venue'}),
+    ('/artists/search', {'search_term': 'Artist'}),
+])
+def test_searches_stay_within_their_query_budget(client, add_venues, url, data):
+    add_venues(10)
+    assert client.post(url, data=data).status_code == 200
+
+
+def test_strict_mode_fails_a_route_over_budget(app, client, add_venues):
+    add_venues(3)
+    app.config['QUERY_BUDGETS'] = dict(app.config['QUERY_BUDGETS'], **{'venues.venues': 1})
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/venues')
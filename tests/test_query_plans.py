@@ -0,0 +1,20 @@
+import pytest
+from models import db
+from plancheck import CHECKS, run_checks
+
+# GIN indexes exist on PostgreSQL only; SQLite filters the JSON genres lists
+POSTGRES_ONLY = {'ix_Venue_genres', 'ix_Artist_genres'}
+
+
+def checks_for(dialect):
+    return [check for check in CHECKS if dialect == 'postgresql' or check[2] not in POSTGRES_ONLY]
+
+
+@pytest.mark.parametrize('description', [check[0] for check in CHECKS])
+def test_query_uses_its_index(app, description):
+    with app.app_context():
+        checks = [check for check in checks_for(db.engine.dialect.name) if check[0] == description]
+        if not checks:
+            pytest.skip('{} needs PostgreSQL'.format(description))
+        [(_, index, used, plan)] = run_checks(checks)
+    assert used, '{} does not use {}:\n{}'.format(description, index, plan)
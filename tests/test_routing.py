@@ -0,0 +1,60 @@
+import time
+import pytest
+from models import db, Venue
+
+
+@pytest.fixture
+def replica(app, tmp_path):
+    # a second SQLite database standing in for a replica; both hold venue 1,
+    # under a different name, so a page shows which one it read
+    app.config['SQLALCHEMY_BINDS'] = {'replica_0': 'sqlite:///' + str(tmp_path / 'replica.db')}
+    row = {'id': 1, 'city': 'New York', 'state': 'NY', 'genres': ['Jazz']}
+    for bind, name in ((None, 'Primary Hall'), ('replica_0', 'Replica Hall')):
+        engine = db.get_engine(app, bind)
+        db.Model.metadata.create_all(bind=engine)
+        engine.execute(Venue.__table__.insert(), [dict(row, name=name)])
+    return engine
+
+
+def read_from(client, method, url, **kwargs):
+    page = getattr(client, method)(url, **kwargs).get_data(as_text=True)
+    if 'Replica Hall' in page:
+        return 'replica'
+    if 'Primary Hall' in page:
+        return 'primary'
+    return None
+
+
+def test_get_reads_from_the_replica(client, replica):
+    assert read_from(client, 'get', '/venues') == 'replica'
+    assert read_from(client, 'get', '/venues/1') == 'replica'
+
+
+def test_search_reads_from_the_replica_and_is_not_a_write(client, replica):
+    assert read_from(client, 'post', '/venues/search', data={'search_term': 'Hall'}) == 'replica'
+    with client.session_transaction() as session:
+        assert 'db_wrote_at' not in session
+
+
+def test_post_writes_to_the_primary(app, client, replica):
+    client.post('/venues/1')
+    assert db.get_engine(app).execute('SELECT count(*) FROM "Venue"').scalar() == 0
+    assert replica.execute('SELECT count(*) FROM "Venue"').scalar() == 1
+    with client.session_transaction() as session:
+        assert 'db_wrote_at' in session
+
+
+def test_reads_stay_on_the_primary_within_the_read_your_writes_window(app, client, replica):
+    with client.session_transaction() as session:
+        session['db_wrote_at'] = time.time()
+    assert read_from(client, 'get', '/venues') == 'primary'
+
+    with client.session_transaction() as session:
+        session['db_wrote_at'] = time.time() - app.config['REPLICA_READ_YOUR_WRITES'] - 1
+    assert read_from(client, 'get', '/venues') == 'replica'
+
+
+def test_without_replicas_everything_uses_the_primary(app, client):
+    db.get_engine(app).execute(Venue.__table__.insert(), [
+        {'name': 'Primary Hall', 'city': 'New York', 'state': 'NY', 'genres': []}])
+    assert read_from(client, 'get', '/venues') == 'primary'
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+from sqlalchemy.exc import SQLAlchemyError
+import shows
+from models import Show, Venue
+
+
+def create_show(client, days):
+    start_time = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+    return client.post('/shows/create', data={'artist_id': 1, 'venue_id': 1, 'start_time': start_time})
+
+
+def test_new_show_updates_counters(app, client, add_venues):
+    add_venues(1, shows_each=0)
+    assert create_show(client, 3).status_code == 200
+    with app.app_context():
+        assert Venue.query.get(1).upcoming_show_count == 1
+
+
+def test_new_show_and_counters_commit_together(app, client, add_venues, monkeypatch):
+    add_venues(1, shows_each=0)
+
+    def fail(*args):
+        raise SQLAlchemyError('counter refresh failed')
+    monkeypatch.setattr(shows, 'refresh_show_counters', fail)
+    create_show(client, 3)
+    with app.app_context():
+        assert Show.query.count() == 0
+
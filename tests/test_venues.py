@@ -0,0 +1,45 @@
+from sqlalchemy.exc import SQLAlchemyError
+import venues
+from models import Venue, Artist
+
+
+def test_venue_listing_statement_count_is_constant(client, statements, add_venues):
+    # one page of venues costs the same queries for 5 venues as for 40
+    counts = []
+    for added in (5, 35):
+        add_venues(added)
+        statements.clear()
+        response = client.get('/venues')
+        assert response.status_code == 200
+        counts.append(len(statements))
+    assert 0 < counts[0] == counts[1]
+
+
+def test_venue_listing_groups_by_area(client, add_venues):
+    add_venues(2, city='New York', state='NY')
+    add_venues(1, city='Austin', state='TX')
+    page = client.get('/venues').get_data(as_text=True)
+    assert page.index('Austin, TX') < page.index('New York, NY')
+    assert page.count('<h3>') == 2
+
+
+def test_retired_venue_leaves_artist_pages_and_counters(app, client, add_venues):
+    add_venues(1, shows_each=2)
+    assert 'Venue 0' in client.get('/artists/1').get_data(as_text=True)
+
+    assert client.post('/venues/1', data={'soft': '1'}).status_code == 200
+    assert 'Venue 0' not in client.get('/artists/1').get_data(as_text=True)
+    with app.app_context():
+        assert Artist.query.get(1).upcoming_show_count == 0
+
+
+def test_venue_delete_and_counter_refresh_commit_together(app, client, add_venues, monkeypatch):
+    add_venues(1, shows_each=3)
+
+    def fail(**kwargs):
+        raise SQLAlchemyError('counter refresh failed')
+    monkeypatch.setattr(venues, 'refresh_show_counters', fail)
+    client.post('/venues/1', data={'soft': '1'})
+    with app.app_context():
+        assert Venue.query.get(1).deleted_at is None
+        assert Artist.query.get(1).upcoming_show_count == 1
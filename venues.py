@@ -0,0 +1,206 @@
+from datetime import datetime
+from itertools import groupby
+from flask import Blueprint, current_app, render_template, request, flash, redirect, url_for, abort
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, Venue, Show
+from pagination import paginate
+from counters import refresh_show_counters
+from search import search_by_name
+from browse import filter_listing
+from readmodels import VenueRow
+from conditional import conditional, versioned
+from extensions import page_cache
+from concurrency import gather
+from routing import read_only
+from views import split_shows, invalidate_venue, venue_artist_ids, listing_version, detail_version, VENUE_PAGE
+
+venue_pages = Blueprint('venues', __name__)
+
+# validator shared by the conditional GET and the page cache of the detail page
+venue_version = versioned(lambda venue_id: detail_version(Venue, venue_id))
+
+#----------------------------------------------------------------------------#
+#  Venues
+#----------------------------------------------------------------------------#
+
+# Show Venue List
+@ venue_pages.route('/venues')
+@ conditional(lambda: listing_version(Venue))
+def venues():
+    # upcoming counts are kept on the venue row, see counters.py
+    venues = db.session.query(
+        Venue.id,
+        Venue.name,
+        Venue.city,
+        Venue.state,
+        Venue.upcoming_show_count.label('num_upcoming_shows')
+    ).filter(Venue.deleted_at.is_(None))
+    page = paginate(filter_listing(venues, Venue), [Venue.city, Venue.state, Venue.id], VenueRow)
+
+    # rows arrive sorted by city, state so each area is a contiguous run
+    data = []
+    for (city, state), area_venues in groupby(page.items, key=lambda x: (x.city, x.state)):
+        data.append({
+            "city": city,
+            "state": state,
+            "venues": list(area_venues)
+        })
+    return render_template('pages/venues.html', areas=data, page=page)
+
+# Create Venue Page
+@ venue_pages.route('/venues/create', methods=['GET'])
+def create_venue_form():
+    from forms import VenueForm
+    form=VenueForm()
+    return render_template('forms/new_venue.html', form=form)
+
+# Create Venue
+@ venue_pages.route('/venues/create', methods=['POST'])
+def create_venue_submission():
+    from forms import VenueForm
+    form=VenueForm(meta={"csrf": False})
+
+    # Error Handling
+    if not form.validate_on_submit():
+        errors = form.errors
+        for error in errors.values():
+            flash( error[0] )
+        return redirect(url_for('.create_venue_form'))
+
+    error=False
+    data=request.form
+
+    try:
+        new_venue=Venue(
+            name=data.get('name'),
+            city=data.get('city'),
+            state=data.get('state'),
+            address=data.get('address'),
+            phone=data.get('phone'),
+            image_link=data.get('image_link'),
+            facebook_link=data.get('facebook_link'),
+            genres=data.getlist('genres'),
+            website=data.get('website'),
+            seeking_talent=bool(data.get('seeking_talent')),
+            seeking_description=data.get('seeking_description')
+        )
+        db.session.add(new_venue)
+        db.session.commit()
+        # on successful db insert, flash success
+        flash('Venue ' + data['name'] + ' was successfully listed!')
+    except():
+        db.session.rollback()
+        error=True
+        flash('An error occurred. Venue ' +
+              data['name'] + ' could not be listed.')
+    return render_template('pages/home.html')
+
+# View Venue Page
+@ venue_pages.route('/venues/<int:venue_id>')
+@ conditional(venue_version)
+@ page_cache.cached(VENUE_PAGE, venue_version)
+def show_venue(venue_id):
+    # the venue row and its shows are independent, fetched concurrently under
+    # gevent; the shows are one joined query, past/upcoming decided in SQL
+    venue, (past_shows, upcoming_shows) = gather(
+        lambda: Venue.query.get(venue_id),
+        lambda: split_shows(Show.info_query().filter(Show.venue_id == venue_id), datetime.now()))
+    if venue is None or venue.deleted_at is not None:
+        abort(404)
+    data = venue.dictionary()
+
+    # add upcoming/past show info to data dictionary
+    data["past_shows"]= past_shows
+    data["upcoming_shows"]= upcoming_shows
+    data["num_past_shows"]= len(past_shows)
+    data["num_upcoming_shows"]= len(upcoming_shows)
+
+    return render_template('pages/show_venue.html', venue=data)
+
+# Search Venue
+@ venue_pages.route('/venues/search', methods=['POST'])
+@ read_only
+def search_venues():
+    search_term = request.form.get('search_term', '')
+    results = search_by_name(Venue, search_term)
+    
+    response = {}
+    response['count'] = len(results)
+    response['data'] = results
+   
+    return render_template('pages/search_venues.html', results=response, search_term=search_term)
+
+# Update Venue Form
+@ venue_pages.route('/venues/<int:venue_id>/edit', methods=['GET'])
+def edit_venue(venue_id):
+    from forms import VenueForm
+    form=VenueForm()
+    venue = Venue.query.get(venue_id).dictionary()
+  
+    return render_template('forms/edit_venue.html', form=form, venue=venue)
+
+# Update Venue
+@ venue_pages.route('/venues/<int:venue_id>/edit', methods=['POST'])
+def edit_venue_submission(venue_id):
+    from forms import VenueForm
+    
+    form=VenueForm(meta={"csrf": False})
+    # Error Handling
+    if not form.validate_on_submit():
+        errors = form.errors
+        for error in errors.values():
+            flash( error[0] )
+        return redirect(url_for('.edit_venue', venue_id=venue_id))
+    
+    error = False
+    data=request.form
+    venue = Venue.query.filter(Venue.id == venue_id).one_or_none()
+
+    try:
+        venue.name=data.get('name'),
+        venue.city=data.get('city'),
+        venue.state=data.get('state'),
+        venue.address=data.get('address'),
+        venue.phone=data.get('phone'),
+        venue.image_link=data.get('image_link'),
+        venue.facebook_link=data.get('facebook_link'),
+        venue.genres=data.getlist('genres'),
+        venue.website=data.get('website'),
+        
+        db.session.commit()
+        invalidate_venue(venue_id)
+        # on successful db insert, flash success
+        flash('Venue ' + data['name'] + ' was successfully updated!')
+    except():
+        db.session.rollback()
+        error=True
+        # on unsuccessful db insert, flash an error
+        flash('An error occurred. Venue' +
+              data['name'] + ' could not be updated.')
+
+    return redirect(url_for('.show_venue', venue_id=venue_id))
+
+# Delete Venue
+@ venue_pages.route('/venues/<int:venue_id>', methods=['POST'])
+def delete_venue(venue_id):
+    venue = Venue.query.get(venue_id)
+    if venue is None or venue.deleted_at is not None:
+        abort(404)
+    try:
+        # before delete() takes the shows linking them away
+        artist_ids = venue_artist_ids(venue_id)
+        if current_app.config['SOFT_DELETE'] or request.form.get('soft'):
+            venue.retire()
+        else:
+            venue.delete()
+        # retired or deleted, its shows no longer count as upcoming for them;
+        # one transaction, so the counters never disagree with the shows
+        refresh_show_counters(artist_ids=artist_ids)
+        db.session.commit()
+        invalidate_venue(venue_id, artist_ids)
+        flash('Venue deleted!')
+        return render_template('pages/home.html')
+    except SQLAlchemyError:
+        db.session.rollback()
+        flash('An error occured. Venue could not be deleted')
+    return redirect(url_for('.show_venue', venue_id=venue_id))
@@ -0,0 +1,99 @@
+from datetime import datetime
+from sqlalchemy import func, case, select
+from models import db, Venue, Artist, Show
+from extensions import page_cache
+
+#----------------------------------------------------------------------------#
+# Helpers shared by the venue, artist and show views.
+#----------------------------------------------------------------------------#
+
+
+def show_dict(row):
+    # Show.info_query() row -> the same dictionary Show.show_info() builds
+    return row._asdict()
+
+
+def split_shows(query, now):
+    # partition show_info rows on an is_past flag computed by the database;
+    # shows at retired venues or by retired artists are left out
+    past_shows = []
+    upcoming_shows = []
+    query = query.filter(Artist.deleted_at.is_(None), Venue.deleted_at.is_(None))
+    for row in query.add_columns((Show.start_time < now).label('is_past')):
+        show = show_dict(row)
+        if show.pop('is_past'):
+            past_shows.append(show)
+        else:
+            upcoming_shows.append(show)
+    return past_shows, upcoming_shows
+
+
+# cached detail pages, see invalidate_venue()/invalidate_artist()
+VENUE_PAGE = 'venue:{venue_id}'
+ARTIST_PAGE = 'artist:{artist_id}'
+
+
+def venue_artist_ids(venue_id):
+    # artists with a show at the venue, i.e. whose pages list it
+    return [artist_id for (artist_id,) in
+            db.session.query(Show.artist_id).filter(Show.venue_id == venue_id).distinct()]
+
+
+def artist_venue_ids(artist_id):
+    # venues with a show by the artist, i.e. whose pages list it
+    return [venue_id for (venue_id,) in
+            db.session.query(Show.venue_id).filter(Show.artist_id == artist_id).distinct()]
+
+
+def invalidate_venue(venue_id, artist_ids=None):
+    # the venue page plus the pages of every artist that lists it. Call after
+    # the commit, else a request in between can cache the old page again;
+    # pass artist_ids when the change (a delete) removes the shows linking them
+    if artist_ids is None:
+        artist_ids = venue_artist_ids(venue_id)
+    page_cache.invalidate(
+        VENUE_PAGE.format(venue_id=venue_id),
+        *[ARTIST_PAGE.format(artist_id=artist_id) for artist_id in artist_ids])
+
+
+def invalidate_artist(artist_id, venue_ids=None):
+    # the artist page plus the pages of every venue that lists it, see
+    # invalidate_venue()
+    if venue_ids is None:
+        venue_ids = artist_venue_ids(artist_id)
+    page_cache.invalidate(
+        ARTIST_PAGE.format(artist_id=artist_id),
+        *[VENUE_PAGE.format(venue_id=venue_id) for venue_id in venue_ids])
+
+# conditional GET validators: (last modified, version) from one small query
+
+
+def listing_version(*models):
+    # max(updated_at) and row count per table catch inserts, edits and deletes
+    columns = []
+    for model in models:
+        columns.append(select([func.max(model.updated_at)]).as_scalar())
+        columns.append(select([func.count(model.id)]).as_scalar())
+    row = db.session.query(*columns).one()
+    return max(filter(None, row[0:len(models) * 2:2]), default=None), tuple(row)
+
+
+def detail_version(model, model_id):
+    # the entity, its shows and whatever sits on the other side of them
+    other = Artist if model is Venue else Venue
+    show_key = Show.venue_id if model is Venue else Show.artist_id
+    other_key = Show.artist_id if model is Venue else Show.venue_id
+    row = db.session.query(
+        model.updated_at,
+        func.max(Show.updated_at),
+        func.max(other.updated_at),
+        func.count(Show.id),
+        func.count(case([(Show.start_time < datetime.now(), Show.id)]))
+    ).outerjoin(Show, show_key == model.id) \
+        .outerjoin(other, other_key == other.id) \
+        .filter(model.id == model_id) \
+        .group_by(model.id) \
+        .first()
+    if row is None:
+        return None, None
+    return max(filter(None, row[:3])), tuple(row)
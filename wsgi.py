@@ -0,0 +1,16 @@
+#----------------------------------------------------------------------------#
+# Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+#----------------------------------------------------------------------------#
+
+from app import create_app
+from extensions import templates
+
+app = create_app()
+# compile every template once here, before the workers fork
+templates.warm_up(app)
+
+# gunicorn preloads this module: import what the app loads lazily now, so the
+# workers share it instead of each importing it on its first request
+import forms
+import babel.dates
+import dateutil.parser